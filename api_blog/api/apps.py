@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core import checks
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from .checks import shared_cache_check
+        checks.register(shared_cache_check, checks.Tags.caches)
+        if settings.WARMUP_ON_STARTUP:
+            from .warmup import warm_up_process
+            warm_up_process()
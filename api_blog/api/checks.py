@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core import checks
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def shared_cache_check(app_configs, **kwargs):
+    """Idempotency keys and the response cache need a shared cache."""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [checks.Warning(
+        f'The default cache {backend} is not shared between processes.',
+        hint=(
+            'Idempotency-Key locks and stored responses, the response '
+            'cache and cached counts only work within one worker. '
+            'Use DatabaseCache or memcached.'
+        ),
+        id='api.W001',
+    )]
@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from reviews.models import Title
+
+datetime_field = serializers.DateTimeField()
+
+
+class FastListSerializer:
+    """
+    Builds list payloads from '.values()' rows.
+    The output matches the regular serializer of the same model.
+    """
+    values_fields = ()
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prefetch(rows)
+        return [self.to_representation(row) for row in rows]
+
+    def prefetch(self, rows):
+        """Bulk-fetches the relations needed for the page."""
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+
+class TitleFastSerializer(FastListSerializer):
+    """Fast list counterpart of TitleReadSerializer."""
+    values_fields = ('id', 'name', 'year', 'description', 'rating',
+                     'category_id', 'category__name', 'category__slug')
+
+    def prefetch(self, rows):
+        self.genres = defaultdict(list)
+        links = Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('-genre_id').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        for title_id, name, slug in links:
+            self.genres[title_id].append({'name': name, 'slug': slug})
+
+    def to_representation(self, row):
+        category = None
+        if row['category_id'] is not None:
+            category = {'name': row['category__name'],
+                        'slug': row['category__slug']}
+        rating = row['rating']
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'description': row['description'],
+            'genre': self.genres[row['id']],
+            'category': category,
+            'rating': int(rating) if rating is not None else None,
+        }
+
+
+class ReviewFastSerializer(FastListSerializer):
+    """Fast list counterpart of ReviewSerializer."""
+    values_fields = ('id', 'author__username', 'title_id',
+                     'text', 'score', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'title': row['title_id'],
+            'text': row['text'],
+            'score': row['score'],
+            'pub_date': datetime_field.to_representation(row['pub_date']),
+        }
+
+
+class CommentFastSerializer(FastListSerializer):
+    """Fast list counterpart of CommentSerializer."""
+    values_fields = ('id', 'author__username', 'review_id',
+                     'text', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'review': row['review_id'],
+            'text': row['text'],
+            'pub_date': datetime_field.to_representation(row['pub_date']),
+        }
@@ -0,0 +1,62 @@
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.filters import TitleFilter
+from api.views import TitleViewSet
+from reviews.models import Comment, Review
+
+FULL_SCAN_MARKERS = {
+    'sqlite': ('SCAN ',),
+    'postgresql': ('Seq Scan',),
+}
+
+SAMPLE_FILTERS = {
+    'name': 'name',
+    'genre': 'genre',
+    'category': 'category',
+    'year': 2000,
+}
+
+PAGE_SIZE = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs EXPLAIN for every TitleFilter combination and the review '
+        'and comment lists, failing if any of them falls back to a full '
+        'table scan. Run it against a database of realistic size.'
+    )
+
+    def get_querysets(self):
+        titles = TitleViewSet.queryset.all()
+        for size in range(1, len(SAMPLE_FILTERS) + 1):
+            for names in combinations(SAMPLE_FILTERS, size):
+                data = {name: SAMPLE_FILTERS[name] for name in names}
+                yield (f'titles {data}',
+                       TitleFilter(data, titles).qs[:PAGE_SIZE])
+        yield 'reviews', Review.objects.filter(title_id=1)[:PAGE_SIZE]
+        yield 'comments', Comment.objects.filter(review_id=1)[:PAGE_SIZE]
+
+    def handle(self, *args, **options):
+        markers = FULL_SCAN_MARKERS.get(connection.vendor)
+        if markers is None:
+            raise CommandError(
+                f'Unsupported database backend: {connection.vendor}.'
+            )
+        failures = []
+        for label, queryset in self.get_querysets():
+            plan = queryset.explain()
+            scans = [line for line in plan.splitlines()
+                     if any(marker in line for marker in markers)]
+            if scans:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'{label}:\n{plan}'))
+            elif options['verbosity'] > 1:
+                self.stdout.write(f'{label}:\n{plan}')
+        if failures:
+            raise CommandError(
+                f'Full table scans in {len(failures)} query plans.'
+            )
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes.'))
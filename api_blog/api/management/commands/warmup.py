@@ -0,0 +1,44 @@
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.warmup import prefill, warm_up_process
+
+
+class Command(BaseCommand):
+    help = (
+        'Warms up the process and prefills the hottest title, genre and '
+        'category pages into the cache, printing cold and warm timings. '
+        'Use the host name clients use, since pages embed absolute links.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=settings.WARMUP_PAGES,
+            help='Number of pages to prefill per list.'
+        )
+        parser.add_argument(
+            '--host', default='localhost',
+            help='Host header of the warm-up requests.'
+        )
+        parser.add_argument(
+            '--scheme', default='http', choices=('http', 'https'),
+            help='Scheme clients use, as seen by Django.'
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        warm_up_process()
+        self.stdout.write(
+            f'Process warm-up: {(perf_counter() - start) * 1000:.1f} ms'
+        )
+        self.stdout.write(
+            f'{"page":<60} {"coding":<9} {"before":>10} {"after":>10}'
+        )
+        for url, encoding, cold, warm in prefill(
+                options['pages'], options['host'], options['scheme']):
+            self.stdout.write(
+                f'{url:<60} {encoding:<9} '
+                f'{cold * 1000:>8.1f}ms {warm * 1000:>8.1f}ms'
+            )
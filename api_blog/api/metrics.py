@@ -0,0 +1,251 @@
+import glob
+import hashlib
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+HISTOGRAMS = (
+    ('api_request_duration_seconds', 'Request latency in seconds.',
+     DURATION_BUCKETS),
+    ('api_db_queries', 'Database queries per request.', QUERY_BUCKETS),
+    ('api_response_size_bytes', 'Response body size in bytes.',
+     SIZE_BUCKETS),
+)
+
+UNMATCHED_ROUTE = 'unmatched'
+
+# What archive_dead does with a metrics file.
+ARCHIVE, KEEP, REMOVE = 'archive', 'keep', 'remove'
+
+DOUBLE_SIZE = array('d').itemsize
+
+
+def route_names(patterns=None):
+    """Names of every route in the URLconf, including router routes."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names.update(route_names(pattern.url_patterns))
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_values(path, size):
+    values = array('d')
+    with open(path, 'rb') as file:
+        values.frombytes(file.read(size * DOUBLE_SIZE))
+    return values
+
+
+def format_value(value):
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class MetricsStore:
+    """
+    Fixed-layout counters in a file mapped by each worker process.
+    Every process writes only its own file, so writers never contend
+    across processes; the /metrics view sums all files of the layout.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.routes = sorted(route_names()) + [UNMATCHED_ROUTE]
+        self.offsets = {}
+        # One slot per route: request count, then per histogram
+        # the bucket counts with an overflow bucket and the sum.
+        self.slot_size = 1 + sum(
+            len(buckets) + 2 for _, _, buckets in HISTOGRAMS
+        )
+        for index, route in enumerate(self.routes):
+            self.offsets[route] = index * self.slot_size
+        self.layout = hashlib.md5(
+            ','.join(self.routes).encode()
+        ).hexdigest()[:12]
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def open(self):
+        """Maps this process' file, creating it on first use."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.pid = os.getpid()
+        path = os.path.join(
+            self.directory, f'metrics_{self.layout}_{self.pid}.db'
+        )
+        size = len(self.routes) * self.slot_size * DOUBLE_SIZE
+        with open(path, 'a+b') as file:
+            file.truncate(size)
+            self.mmap = mmap.mmap(file.fileno(), size)
+        self.values = memoryview(self.mmap).cast('d')
+
+    def observe(self, route, duration, queries, size):
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.open()
+        position = self.offsets.get(route, self.offsets[UNMATCHED_ROUTE])
+        values = self.values
+        with self.lock:
+            values[position] += 1
+            position += 1
+            for (_, _, buckets), value in zip(
+                    HISTOGRAMS, (duration, queries, size)):
+                values[position + bisect_left(buckets, value)] += 1
+                position += len(buckets) + 1
+                values[position] += value
+                position += 1
+
+    @contextmanager
+    def locked(self):
+        """Serializes archiving and reading between scraping processes."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, 'metrics.lock')
+        with open(path, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def classify(self, path):
+        """
+        ARCHIVE for files of exited processes of this layout,
+        REMOVE for archives and dead files of other layouts,
+        KEEP for everything else.
+        """
+        parts = os.path.basename(path)[:-len('.db')].split('_')
+        if len(parts) != 3:
+            return KEEP
+        _, layout, pid = parts
+        if pid == 'archive':
+            return KEEP if layout == self.layout else REMOVE
+        if not pid.isdigit() or is_alive(int(pid)):
+            return KEEP
+        return ARCHIVE if layout == self.layout else REMOVE
+
+    def fold(self, paths):
+        """Adds the values of the files to the archive file."""
+        size = len(self.routes) * self.slot_size
+        archive_path = os.path.join(
+            self.directory, f'metrics_{self.layout}_archive.db'
+        )
+        if os.path.exists(archive_path):
+            archived = read_values(archive_path, size)
+        else:
+            archived = array('d', bytes(size * DOUBLE_SIZE))
+        for path in paths:
+            for index, value in enumerate(read_values(path, size)):
+                archived[index] += value
+        temporary = archive_path + '.tmp'
+        with open(temporary, 'wb') as file:
+            archived.tofile(file)
+        os.replace(temporary, archive_path)
+
+    def archive_dead(self):
+        """
+        Folds the files of exited processes into the archive file
+        of the layout and removes them, so recycled workers do not
+        leave files behind. Files of other layouts are only removed.
+        Skipped without fcntl: on Windows os.kill(pid, 0) would
+        terminate the process instead of probing it.
+        """
+        if fcntl is None:
+            return
+        paths = glob.glob(os.path.join(self.directory, 'metrics_*.db'))
+        actions = {path: self.classify(path) for path in paths}
+        dead = [path for path in paths if actions[path] == ARCHIVE]
+        if dead:
+            self.fold(dead)
+        for path in paths:
+            if actions[path] != KEEP:
+                os.remove(path)
+
+    def collect(self):
+        """Sums the archive and the files of live processes of this layout."""
+        totals = array('d', bytes(
+            len(self.routes) * self.slot_size * DOUBLE_SIZE
+        ))
+        pattern = os.path.join(self.directory, f'metrics_{self.layout}_*.db')
+        with self.locked():
+            self.archive_dead()
+            for path in glob.glob(pattern):
+                for index, value in enumerate(
+                        read_values(path, len(totals))):
+                    totals[index] += value
+        return totals
+
+    def render(self):
+        """Prometheus text exposition of the collected values."""
+        totals = self.collect()
+        active = [
+            route for route in self.routes if totals[self.offsets[route]]
+        ]
+        lines = [
+            '# HELP api_requests_total Total HTTP requests.',
+            '# TYPE api_requests_total counter',
+        ]
+        for route in active:
+            lines.append(
+                f'api_requests_total{{route="{route}"}} '
+                f'{format_value(totals[self.offsets[route]])}'
+            )
+        position = 1
+        for name, help_text, buckets in HISTOGRAMS:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for route in active:
+                start = self.offsets[route]
+                total = totals[start + position + len(buckets) + 1]
+                cumulative = 0.0
+                for index, bound in enumerate(buckets + ('+Inf',)):
+                    cumulative += totals[start + position + index]
+                    lines.append(
+                        f'{name}_bucket{{route="{route}",le="{bound}"}} '
+                        f'{format_value(cumulative)}'
+                    )
+                lines.append(
+                    f'{name}_sum{{route="{route}"}} '
+                    f'{format_value(total)}'
+                )
+                lines.append(
+                    f'{name}_count{{route="{route}"}} '
+                    f'{format_value(totals[start])}'
+                )
+            position += len(buckets) + 2
+        return '\n'.join(lines) + '\n'
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = MetricsStore(settings.METRICS_DIR)
+    return _store
@@ -0,0 +1,267 @@
+import gzip
+import hashlib
+import json
+import logging
+import random
+from time import perf_counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection, transaction
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .metrics import get_store
+from reviews.models import ChangeLogEntry
+
+slow_query_logger = logging.getLogger('api.slow_queries')
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/')
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def negotiate_encoding(request):
+    """
+    Best content coding the client accepts: brotli when the module
+    is installed, then gzip. Returns None for an identity response.
+    """
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    supported = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best = None
+    for coding in supported:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best else None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class QueryCounter:
+    """Database execute wrapper counting the statements it sees."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Records latency, query count and response size per route."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.store = get_store()
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        duration = perf_counter() - start
+        match = request.resolver_match
+        size = 0 if response.streaming else len(response.content)
+        self.store.observe(
+            match.url_name if match else None,
+            duration, counter.count, size
+        )
+        return response
+
+
+class SlowQueryRecorder:
+    """
+    Database execute wrapper logging SELECT statements slower than
+    the threshold together with their EXPLAIN output.
+    """
+
+    def __init__(self, request, threshold):
+        self.request = request
+        self.threshold = threshold
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+        start = perf_counter()
+        result = execute(sql, params, many, context)
+        duration = perf_counter() - start
+        if (duration >= self.threshold and not many
+                and sql.lstrip()[:6].upper() == 'SELECT'):
+            self.record(context['connection'], sql, params, duration)
+        return result
+
+    def explain(self, db, sql, params):
+        self.explaining = True
+        try:
+            with transaction.atomic(using=db.alias):
+                with db.cursor() as cursor:
+                    cursor.execute(
+                        f'{db.ops.explain_query_prefix()} {sql}', params
+                    )
+                    return '\n'.join(
+                        ' '.join(str(column) for column in row)
+                        for row in cursor.fetchall()
+                    )
+        except DatabaseError as error:
+            return f'EXPLAIN failed: {error}'
+        finally:
+            self.explaining = False
+
+    def record(self, db, sql, params, duration):
+        match = self.request.resolver_match
+        slow_query_logger.warning(json.dumps({
+            'duration_ms': round(duration * 1000, 3),
+            'route': match.url_name if match else None,
+            'view': match.view_name if match else None,
+            'method': self.request.method,
+            'path': self.request.get_full_path(),
+            'sql': sql,
+            'params': params,
+            'plan': self.explain(db, sql, params),
+        }, default=str, ensure_ascii=False))
+
+
+class SlowQueryLogMiddleware:
+    """Samples requests and records their slow queries."""
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        self.sample_rate = settings.SLOW_QUERY_SAMPLE_RATE
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        recorder = SlowQueryRecorder(request, self.threshold)
+        with connection.execute_wrapper(recorder):
+            return self.get_response(request)
+
+
+class ResponseCacheMiddleware:
+    """
+    Caches rendered JSON of public list pages for anonymous clients.
+    Keys include the head of the change log, so any change
+    to the catalog or the reviews makes older entries unreachable.
+    Placed before CompressionMiddleware, it stores compressed bytes
+    under a key that includes the negotiated encoding.
+    """
+
+    def __init__(self, get_response):
+        if not settings.RESPONSE_CACHE_TIMEOUT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.routes = set(settings.RESPONSE_CACHE_ROUTES)
+
+    def get_cache_key(self, request):
+        """
+        Normalized key: the absolute URL, since pages embed absolute
+        next links, and the negotiated encoding instead of raw headers.
+        """
+        version = ChangeLogEntry.objects.order_by('-id').values_list(
+            'id', flat=True).first() or 0
+        raw = '|'.join((
+            str(version),
+            request.build_absolute_uri(),
+            negotiate_encoding(request) or 'identity',
+        ))
+        return 'response:' + hashlib.md5(raw.encode()).hexdigest()
+
+    def is_cacheable(self, request):
+        """
+        Anonymous GETs of plain JSON; the browsable API and
+        indented JSON are rendered differently and bypass the cache.
+        """
+        if request.method != 'GET' or 'HTTP_AUTHORIZATION' in request.META:
+            return False
+        accept = request.META.get('HTTP_ACCEPT', '')
+        return 'text/html' not in accept and 'indent=' not in accept
+
+    def __call__(self, request):
+        if not self.is_cacheable(request):
+            return self.get_response(request)
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return self.get_response(request)
+        if match.url_name not in self.routes:
+            return self.get_response(request)
+        key = self.get_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            request.resolver_match = match
+            content, headers = cached
+            response = HttpResponse(content)
+            for name, value in headers:
+                response[name] = value
+            return response
+        response = self.get_response(request)
+        if (response.status_code == 200 and not response.streaming
+                and response.get('Content-Type', '').startswith(
+                    'application/json')):
+            cache.set(
+                key, (response.content, list(response.items())),
+                settings.RESPONSE_CACHE_TIMEOUT
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compresses text and JSON responses with brotli or gzip
+    when the body reaches COMPRESSION_MIN_SIZE bytes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(
+                COMPRESSIBLE_TYPES):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+        encoding = negotiate_encoding(request)
+        if encoding is None:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
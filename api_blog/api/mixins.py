@@ -1,4 +1,15 @@
-from rest_framework import viewsets, mixins
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, When
+from django.http import QueryDict
+from rest_framework import status, viewsets, mixins
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from reviews.constants import MULTI_GET_MAX_IDS
 
 
 class CreateListDestroyViewSet(mixins.CreateModelMixin,
@@ -6,3 +17,134 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
     """A mixin with a set of necessary methods."""
+
+
+class FastListMixin:
+    """
+    Serves the list action from '.values()' rows
+    without instantiating a serializer per object.
+    Paginators count 'count_queryset', free of the joins
+    the values need.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.fast_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+        self.count_queryset = queryset
+        rows = queryset.values(*serializer.values_fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+
+class MultiGetMixin:
+    """
+    Lets the list action return the objects named in '?ids=1,2,3'
+    with one query, in the requested order and without pagination.
+    """
+    multi_get_query_param = 'ids'
+
+    def get_multi_get_ids(self):
+        if self.action != 'list':
+            return None
+        raw = self.request.query_params.get(self.multi_get_query_param)
+        if raw is None:
+            return None
+        ids = list(dict.fromkeys(
+            value.strip() for value in raw.split(',') if value.strip()
+        ))
+        if len(ids) > MULTI_GET_MAX_IDS:
+            raise ValidationError({
+                self.multi_get_query_param:
+                    f'No more than {MULTI_GET_MAX_IDS} ids are allowed.'
+            })
+        if self.lookup_field == 'pk' and not all(
+                value.isdigit() for value in ids):
+            raise ValidationError(
+                {self.multi_get_query_param: 'Ids must be integers.'}
+            )
+        return ids
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ids = self.get_multi_get_ids()
+        if ids is None:
+            return queryset
+        if not ids:
+            return queryset.none()
+        return queryset.filter(
+            **{f'{self.lookup_field}__in': ids}
+        ).order_by(Case(*(
+            When(**{self.lookup_field: value}, then=position)
+            for position, value in enumerate(ids)
+        )))
+
+    def paginate_queryset(self, queryset):
+        if self.get_multi_get_ids() is not None:
+            return None
+        return super().paginate_queryset(queryset)
+
+
+class IdempotentCreateMixin:
+    """
+    Stores the first successful response of a create sent with an
+    'Idempotency-Key' header and replays it for retries of the same
+    user, path and key, without running serializers or writes again.
+    """
+    idempotency_header = 'Idempotency-Key'
+
+    def canonical_data(self, request):
+        """
+        Parsed request data in a stable form, so retries encoded
+        differently (a new multipart boundary) match the original.
+        """
+        data = request.data
+        if isinstance(data, QueryDict):
+            data = dict(data.lists())
+        return json.dumps(data, sort_keys=True, default=str)
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if not key or not request.user.is_authenticated:
+            return super().create(request, *args, **kwargs)
+        digest = hashlib.sha256(
+            f'{request.user.pk}:{request.path}:{key}'.encode()
+        ).hexdigest()
+        cache_key = f'idempotency:{digest}'
+        fingerprint = hashlib.sha256(
+            self.canonical_data(request).encode()
+        ).hexdigest()
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(f'{cache_key}:lock', True,
+                             settings.IDEMPOTENCY_LOCK_TIMEOUT):
+                return Response(
+                    {'detail': 'A request with this Idempotency-Key '
+                               'is already in progress.'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            try:
+                stored = cache.get(cache_key)
+                if stored is None:
+                    response = super().create(request, *args, **kwargs)
+                    cache.set(
+                        cache_key,
+                        (fingerprint, response.status_code,
+                         dict(response.data)),
+                        settings.IDEMPOTENCY_KEY_TIMEOUT
+                    )
+                    return response
+            finally:
+                cache.delete(f'{cache_key}:lock')
+        stored_fingerprint, status_code, data = stored
+        if stored_fingerprint != fingerprint:
+            return Response(
+                {'detail': 'This Idempotency-Key was used '
+                           'with a different request body.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        return Response(
+            data, status=status_code, headers={'Idempotent-Replayed': 'true'}
+        )
@@ -0,0 +1,198 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.constants import (CHANGE_FEED_MAX_LIMIT, CHANGE_FEED_PAGE_SIZE,
+                               ESTIMATED_COUNT_LIMIT)
+from reviews.stats import count_version_key
+
+
+def non_negative_int(request, name, default):
+    value = request.query_params.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: 'A non-negative integer is required.'})
+    if value < 0:
+        raise ValidationError({name: 'A non-negative integer is required.'})
+    return value
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        'Changes after this cursor were trimmed from the log. '
+        'Reload the data and continue from the returned cursor.'
+    )
+    default_code = 'cursor_expired'
+
+    def __init__(self, cursor):
+        super().__init__()
+        self.detail = {'detail': self.detail, 'cursor': cursor}
+
+
+class ChangeFeedPagination(BasePagination):
+    """
+    Pagination by a 'since' cursor over increasing ids.
+    Entries younger than CHANGE_FEED_LAG_SECONDS are held back
+    until the transactions that took lower ids have committed.
+    A cursor older than the retained log gets 410 Gone
+    with the current head to continue from after a full reload.
+    """
+    since_query_param = 'since'
+    limit_query_param = 'limit'
+    default_limit = CHANGE_FEED_PAGE_SIZE
+    max_limit = CHANGE_FEED_MAX_LIMIT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.since = non_negative_int(request, self.since_query_param, 0)
+        self.limit = min(
+            non_negative_int(
+                request, self.limit_query_param, self.default_limit
+            ) or self.default_limit,
+            self.max_limit
+        )
+        queryset = queryset.filter(created__lt=timezone.now() - timedelta(
+            seconds=settings.CHANGE_FEED_LAG_SECONDS
+        ))
+        if self.since:
+            self.check_retained(queryset)
+        page = list(
+            queryset.filter(pk__gt=self.since).order_by('pk')[:self.limit + 1]
+        )
+        self.has_more = len(page) > self.limit
+        page = page[:self.limit]
+        self.cursor = page[-1].pk if page else self.since
+        return page
+
+    def check_retained(self, queryset):
+        """Fails if entries right after the cursor may have been trimmed."""
+        oldest = queryset.order_by('pk').values_list(
+            'pk', flat=True).first()
+        if oldest is not None and oldest > self.since + 1:
+            head = queryset.order_by('-pk').values_list(
+                'pk', flat=True).first()
+            raise CursorExpired(head)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'cursor': self.cursor,
+            'has_more': self.has_more,
+            'results': data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.since_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor returned by the previous page.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.limit_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of events to return.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class CachedCountPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination that avoids an exact COUNT(*) per page.
+    The count comes from the view's denormalized counter when it has
+    one, from a page shorter than the limit, otherwise from a cached
+    count capped at ESTIMATED_COUNT_LIMIT and reported as "10000+".
+    '?exact_count=true' forces COUNT(*).
+    Cached counts are only displayed: pages are always fetched.
+    """
+    exact_count_query_param = 'exact_count'
+    count_limit = ESTIMATED_COUNT_LIMIT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.request = request
+        self.view = view
+        self.count_capped = False
+        self.count_estimated = False
+        self.offset = self.get_offset(request)
+        self.page = list(queryset[self.offset:self.offset + self.limit])
+        self.count = self.get_count(queryset)
+        if self.count_estimated and not self.count_capped:
+            self.count = max(self.count, self.offset + len(self.page))
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_count(self, queryset):
+        if self.request.query_params.get(
+                self.exact_count_query_param) in ('1', 'true', 'True'):
+            return super().get_count(queryset)
+        get_denormalized_count = getattr(
+            self.view, 'get_denormalized_count', None)
+        if get_denormalized_count is not None:
+            count = get_denormalized_count()
+            if count is not None:
+                return count
+        if len(self.page) < self.limit and (self.page or not self.offset):
+            # A short page is the last one.
+            return self.offset + len(self.page)
+        self.count_estimated = True
+        count = self.get_cached_count(queryset)
+        if count > self.count_limit:
+            self.count_capped = True
+            return self.count_limit
+        return count
+
+    def get_cached_count(self, queryset):
+        """
+        Counts up to count_limit + 1 ids of the rows, without
+        the selected columns, annotations and joins of the page.
+        The result is kept under the model's count version, which
+        creates and deletes replace (see 'touch_counts').
+        """
+        queryset = getattr(self.view, 'count_queryset', queryset)
+        ids = queryset.order_by().values('pk')[:self.count_limit + 1]
+        version_key = count_version_key(queryset.model)
+        key = 'count:' + hashlib.md5(str(ids.query).encode()).hexdigest()
+        cached = cache.get_many((version_key, key))
+        version = cached.get(version_key)
+        if key in cached and cached[key][0] == version:
+            return cached[key][1]
+        count = queryset.model._base_manager.filter(pk__in=ids).count()
+        cache.set(
+            key, (version, count), settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+        return count
+
+    def get_next_link(self):
+        if not self.count_estimated:
+            return super().get_next_link()
+        if len(self.page) < self.limit:
+            return None
+        url = replace_query_param(
+            self.request.build_absolute_uri(),
+            self.limit_query_param, self.limit
+        )
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count_capped:
+            response.data['count'] = f'{self.count}+'
+        return response
@@ -3,8 +3,10 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from rest_framework import serializers
 
-from reviews.constants import EMAIL_MAX_LEN, USERNAME_MAX_LEN
-from reviews.models import Category, Comment, CustomUser, Genre, Review, Title
+from reviews.constants import (BATCH_MAX_REQUESTS, EMAIL_MAX_LEN,
+                               USERNAME_MAX_LEN)
+from reviews.models import (Category, ChangeLogEntry, Comment, CustomUser,
+                            Genre, Review, Title)
 
 username_validator = UnicodeUsernameValidator()
 
@@ -21,12 +23,15 @@ def not_me_validator(value):
 
 class UsersSerializer(serializers.ModelSerializer):
     """Serializer for CustomUser model."""
+    average_score = serializers.FloatField(read_only=True)
 
     class Meta:
         model = CustomUser
         fields = (
             'username', 'email', 'first_name',
-            'last_name', 'bio', 'role')
+            'last_name', 'bio', 'role',
+            'review_count', 'comment_count', 'average_score')
+        read_only_fields = ('review_count', 'comment_count')
 
 
 class SignUpSerializer(serializers.Serializer):
@@ -94,7 +99,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = '__all__'
+        fields = ('id', 'author', 'title', 'text', 'score', 'pub_date')
 
     def validate(self, data):
         """Validation of data during POST request."""
@@ -117,7 +122,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        fields = ('id', 'author', 'review', 'text', 'pub_date')
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -196,3 +201,45 @@ class TitleCreateSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         representation['id'] = instance.id
         return representation
+
+
+class ChangeLogEntrySerializer(serializers.ModelSerializer):
+    """Serializer for ChangeLogEntry model."""
+    class Meta:
+        model = ChangeLogEntry
+        fields = ('id', 'model', 'object_id', 'title_id',
+                  'review_id', 'action', 'created')
+
+
+class BatchSerializer(serializers.Serializer):
+    """Serializer for a list of GET sub-requests."""
+    requests = serializers.ListField(
+        child=serializers.RegexField(regex=r'^/api/'),
+        min_length=1,
+        max_length=BATCH_MAX_REQUESTS,
+    )
+
+
+class ModerationSerializer(serializers.Serializer):
+    """Serializer for a bulk moderation action."""
+    target = serializers.ChoiceField(choices=('reviews', 'comments'))
+    action = serializers.ChoiceField(choices=('delete', 'hide'))
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+    author = serializers.SlugRelatedField(
+        queryset=CustomUser.objects.all(),
+        slug_field='username',
+        required=False
+    )
+    text = serializers.CharField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        """At least one of 'ids', 'author' or 'text' is required."""
+        if not any(data.get(field) for field in ('ids', 'author', 'text')):
+            raise serializers.ValidationError(
+                "Specify 'ids', 'author' or 'text'."
+            )
+        return data
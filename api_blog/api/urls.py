@@ -2,8 +2,9 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    CategoryViewSet, CommentViewSet, GenreViewSet,
-    GetTokenViewSet, ReviewViewSet, SignupViewSet,
+    BatchViewSet, CategoryViewSet, ChangeViewSet, CommentViewSet,
+    GenreViewSet, GetTokenViewSet, ModerationViewSet, ReviewViewSet,
+    SignupViewSet,
     TitleViewSet, UsersViewSet
 )
 
@@ -43,6 +44,12 @@ router.register(
     CommentViewSet, basename='comments'
 )
 
+router.register(
+    r'changes',
+    ChangeViewSet,
+    basename='changes'
+)
+
 app_name = 'users'
 
 urlpatterns = [
@@ -53,4 +60,10 @@ urlpatterns = [
     path('v1/auth/signup/',
          SignupViewSet.as_view({'post': 'create'}),
          name='signup'),
+    path('v1/batch/',
+         BatchViewSet.as_view({'post': 'create'}),
+         name='batch'),
+    path('v1/moderation/',
+         ModerationViewSet.as_view({'post': 'create'}),
+         name='moderation'),
 ]
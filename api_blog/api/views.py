@@ -1,8 +1,9 @@
 from django.conf import settings
-from django.db.models import Avg
+from django.db.models import Avg, OuterRef, Subquery
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework_simplejwt.tokens import AccessToken
@@ -11,17 +12,30 @@ from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated, SAFE_METHODS
 from rest_framework.response import Response
 
+from .batch import execute
+from .fast_serializers import (CommentFastSerializer, ReviewFastSerializer,
+                               TitleFastSerializer)
 from .filters import TitleFilter
-from .mixins import CreateListDestroyViewSet
+from .metrics import get_store
+from .mixins import (CreateListDestroyViewSet, FastListMixin,
+                     IdempotentCreateMixin, MultiGetMixin)
+from .pagination import CachedCountPagination, ChangeFeedPagination
 from .permissions import (AuthorOrReadOnlyPermission, IsAdmin,
-                          IsAdminOrReadOnly, ReadOnlyPermission)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer,
+                          IsAdminOrReadOnly, IsModerator,
+                          ReadOnlyPermission)
+from .serializers import (BatchSerializer, CategorySerializer,
+                          ChangeLogEntrySerializer,
+                          CommentSerializer, GenreSerializer,
+                          ModerationSerializer, ReviewSerializer,
                           SignUpSerializer, TitleCreateSerializer,
                           TitleReadSerializer, UserGetTokenSerializer,
                           UsersSerializer)
 from reviews.constants import TITLE_NAME_MAX_LEN
-from reviews.models import Category, CustomUser, Genre, Review, Title
+from reviews.models import (Category, ChangeLogEntry, Comment, CustomUser,
+                            Genre, Review, Title)
+from reviews.services import (delete_review, delete_title, delete_user,
+                              moderate_delete, moderate_hide,
+                              select_for_moderation)
 
 
 def send_conf_code(email, confirmation_code):
@@ -34,6 +48,14 @@ def send_conf_code(email, confirmation_code):
     )
 
 
+def metrics(request):
+    """Prometheus metrics of all worker processes."""
+    return HttpResponse(
+        get_store().render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
 class SignupViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     """ViewSet of new user registration."""
     queryset = CustomUser.objects.all()
@@ -64,11 +86,12 @@ class UsersViewSet(mixins.ListModelMixin,
                    viewsets.GenericViewSet):
     """Viewset for User model objects."""
 
-    queryset = CustomUser.objects.all()
+    queryset = CustomUser.objects.filter(pending_deletion=False)
     serializer_class = UsersSerializer
     permission_classes = (IsAuthenticated, IsAdmin,)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
     search_fields = ('username',)
+    ordering_fields = ('username', 'review_count', 'comment_count')
 
     @action(
         detail=False,
@@ -82,14 +105,16 @@ class UsersViewSet(mixins.ListModelMixin,
         Retrieves information about the user from the 'username'
         field with the ability to edit.
         """
-        user = get_object_or_404(CustomUser, username=username)
+        user = get_object_or_404(
+            CustomUser, username=username, pending_deletion=False
+        )
         if request.method == 'PATCH':
             serializer = UsersSerializer(user, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
         elif request.method == 'DELETE':
-            user.delete()
+            delete_user(user)
             return Response(status=status.HTTP_204_NO_CONTENT)
         serializer = UsersSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -138,14 +163,23 @@ class GetTokenViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
         return Response(message, status=status.HTTP_200_OK)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(FastListMixin, MultiGetMixin, viewsets.ModelViewSet):
     """ViewSet of Title model."""
-    queryset = Title.objects.order_by('id').annotate(
-        rating=Avg('reviews__score'))
+    queryset = Title.objects.filter(pending_deletion=False).annotate(
+        rating=Subquery(
+            Review.objects.filter(
+                title=OuterRef('pk'), is_hidden=False,
+                author__pending_deletion=False
+            ).order_by().values('title').annotate(
+                rating=Avg('score')
+            ).values('rating')
+        )
+    ).order_by('id')
     permission_classes = [IsAdminOrReadOnly, ]
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountPagination
+    fast_serializer_class = TitleFastSerializer
 
     def update(self, request, *args, **kwargs):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -171,6 +205,9 @@ class TitleViewSet(viewsets.ModelViewSet):
         self.perform_update(serializer)
         return Response(serializer.data)
 
+    def perform_destroy(self, instance):
+        delete_title(instance)
+
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return TitleReadSerializer
@@ -195,7 +232,7 @@ class CategoryViewSet(CreateListDestroyViewSet):
         return queryset
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+class GenreViewSet(MultiGetMixin, CreateListDestroyViewSet):
     """ViewSet of Genre model."""
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
@@ -213,11 +250,13 @@ class GenreViewSet(CreateListDestroyViewSet):
         return queryset
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(IdempotentCreateMixin, FastListMixin, MultiGetMixin,
+                    viewsets.ModelViewSet):
     """ViewSet Review model."""
     serializer_class = ReviewSerializer
+    fast_serializer_class = ReviewFastSerializer
     permission_classes = (AuthorOrReadOnlyPermission,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_permissions(self):
@@ -226,19 +265,34 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        title_id = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title_id.reviews.all()
+        title_id = get_object_or_404(
+            Title, id=self.kwargs.get('title_id'), pending_deletion=False
+        )
+        self.title = title_id
+        return title_id.reviews.filter(
+            is_hidden=False, author__pending_deletion=False
+        )
+
+    def get_denormalized_count(self):
+        return self.title.review_count
 
     def perform_create(self, serializer):
-        title_id = get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        title_id = get_object_or_404(
+            Title, id=self.kwargs.get('title_id'), pending_deletion=False
+        )
         serializer.save(author=self.request.user, title=title_id)
 
+    def perform_destroy(self, instance):
+        delete_review(instance)
+
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(IdempotentCreateMixin, FastListMixin,
+                     viewsets.ModelViewSet):
     """ViewSet of Comment modeld."""
     serializer_class = CommentSerializer
+    fast_serializer_class = CommentFastSerializer
     permission_classes = (AuthorOrReadOnlyPermission,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_permissions(self):
@@ -247,9 +301,72 @@ class CommentViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        review_id = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return review_id.comments.all()
+        review_id = get_object_or_404(
+            Review, id=self.kwargs.get('review_id'), is_hidden=False,
+            title__pending_deletion=False, author__pending_deletion=False
+        )
+        return review_id.comments.filter(
+            is_hidden=False, author__pending_deletion=False
+        )
 
     def perform_create(self, serializer):
-        review_id = get_object_or_404(Review, id=self.kwargs.get('review_id'))
+        review_id = get_object_or_404(
+            Review, id=self.kwargs.get('review_id'), is_hidden=False,
+            title__pending_deletion=False, author__pending_deletion=False
+        )
         serializer.save(author=self.request.user, review=review_id)
+
+
+class ChangeViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Ordered change events for sync clients.
+    Clients pass the returned cursor as 'since' to get the next batch.
+    """
+    queryset = ChangeLogEntry.objects.all()
+    serializer_class = ChangeLogEntrySerializer
+    permission_classes = (ReadOnlyPermission,)
+    pagination_class = ChangeFeedPagination
+
+
+class BatchViewSet(viewsets.ViewSet):
+    """
+    Executes a list of GET sub-requests in-process and returns
+    all results together. Each sub-request keeps its own permissions.
+    """
+    permission_classes = (AllowAny,)
+
+    def create(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = [
+            execute(request, path)
+            for path in serializer.validated_data['requests']
+        ]
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class ModerationViewSet(viewsets.ViewSet):
+    """
+    Deletes or hides reviews and comments in bulk
+    by id list, author or text within a time window.
+    """
+    permission_classes = (IsModerator,)
+
+    def create(self, request):
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        model = Review if data['target'] == 'reviews' else Comment
+        queryset = select_for_moderation(
+            model,
+            ids=data.get('ids'),
+            author=data.get('author'),
+            text=data.get('text'),
+            since=data.get('since'),
+            until=data.get('until'),
+        )
+        if data['action'] == 'delete':
+            affected = moderate_delete(queryset)
+        else:
+            affected = moderate_hide(queryset)
+        return Response(affected, status=status.HTTP_200_OK)
@@ -0,0 +1,86 @@
+import json
+import sys
+from io import BytesIO
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.contrib import admin
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import NoReverseMatch, reverse
+from rest_framework import serializers
+
+from .metrics import route_names
+from .middleware import brotli
+
+WARMUP_ROUTES = ('titles-list', 'genres-list', 'categories-list')
+
+
+def warm_up_process():
+    """
+    Imports the views and serializers, builds the URL resolver
+    and the serializer field maps. Does not touch the database.
+    """
+    from . import serializers as api_serializers, views  # noqa: F401
+
+    # The admin registry must be complete before the URLconf is built.
+    admin.autodiscover()
+    for name in route_names():
+        try:
+            reverse(f'users:{name}')
+        except NoReverseMatch:
+            pass
+    for value in vars(api_serializers).values():
+        if (isinstance(value, type)
+                and issubclass(value, serializers.Serializer)
+                and value.__module__ == api_serializers.__name__):
+            value().fields
+
+
+def fetch(handler, url, host, scheme='http', encoding=None):
+    """
+    Runs a GET through the full middleware stack.
+    Returns the seconds it took and the response body.
+    """
+    url = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '443' if scheme == 'https' else '80',
+        'HTTP_HOST': host,
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': scheme,
+    }
+    if encoding is not None:
+        environ['HTTP_ACCEPT_ENCODING'] = encoding
+    start = perf_counter()
+    response = handler(environ, lambda status, headers: None)
+    content = b''.join(response)
+    response.close()
+    return perf_counter() - start, content
+
+
+def prefill(pages, host, scheme='http'):
+    """
+    Requests the first pages of the hottest lists the way clients do:
+    the bare list URL, then the 'next' links, once per content coding.
+    Yields the URL and coding with the cold and the warm timing.
+    """
+    handler = WSGIHandler()
+    encodings = [None, 'gzip'] + (['br'] if brotli is not None else [])
+    for route in WARMUP_ROUTES:
+        url = reverse(f'users:{route}')
+        for _ in range(pages):
+            next_url = None
+            for encoding in encodings:
+                cold, content = fetch(handler, url, host, scheme, encoding)
+                warm, _ = fetch(handler, url, host, scheme, encoding)
+                yield url, encoding or 'identity', cold, warm
+                if encoding is None:
+                    next_url = json.loads(content).get('next')
+            if not next_url:
+                break
+            url = next_url
@@ -28,7 +28,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.ResponseCacheMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -90,6 +94,11 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
 
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 4,
 }
@@ -103,6 +112,84 @@ AUTH_USER_MODEL = 'reviews.CustomUser'
 
 TEST_EMAIL = 'Testforrest2023@gmail.com'
 
+# Deletes touching more reviews and comments than this are deferred
+# to the 'purge_deleted' management command.
+BULK_DELETE_DEFER_THRESHOLD = 10000
+
+# The cache must be shared by all worker processes: Idempotency-Key
+# locks and stored responses, the response cache, cached counts and
+# 'warmup' rely on it. The default is a database table, created with
+# "createcachetable"; check api.W001 warns about process-local caches.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_cache'),
+    }
+}
+
+# Change log ids are taken at INSERT, not at commit, so the change
+# feed only serves entries older than this: a transaction committing
+# later could otherwise add an id below a cursor already handed out.
+CHANGE_FEED_LAG_SECONDS = 5
+
+# Rendered JSON of these routes is cached for anonymous clients;
+# a timeout of 0 disables the response cache.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 0))
+RESPONSE_CACHE_ROUTES = ('titles-list', 'genres-list', 'categories-list')
+
+# Text and JSON responses of at least this many bytes are sent
+# with brotli (when installed) or gzip content coding.
+COMPRESSION_MIN_SIZE = 1024
+
+# Pre-import and resolve the API when a process starts; the 'warmup'
+# command additionally prefills the hottest pages into the cache.
+WARMUP_ON_STARTUP = os.getenv('WARMUP_ON_STARTUP') == 'True'
+WARMUP_PAGES = 3
+
+# Responses to creates sent with an Idempotency-Key header are kept
+# this long; the lock guards concurrent retries of the same key.
+# Both live in the shared cache configured in CACHES.
+IDEMPOTENCY_KEY_TIMEOUT = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TIMEOUT = 30
+
+# Lifetime of the cached list counts used by CachedCountPagination.
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Per-process metric files, summed by the /metrics endpoint.
+METRICS_DIR = os.getenv('METRICS_DIR', BASE_DIR / 'metrics')
+
+# Opt-in log of slow SELECT statements with their EXPLAIN plans,
+# recorded for a sampled share of requests.
+SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED') == 'True'
+SLOW_QUERY_THRESHOLD_MS = int(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', 0.1))
+SLOW_QUERY_LOG_FILE = os.getenv(
+    'SLOW_QUERY_LOG_FILE', BASE_DIR / 'slow_queries.log'
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'api.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -1,6 +1,17 @@
 from django.contrib import admin
 
-from .models import Category, CustomUser, Genre, Title
+from .models import Category, Comment, CustomUser, Genre, Review, Title
+from .paginators import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings that keep large tables fast.
+    Searches are prefix or exact matches served by indexes;
+    on PostgreSQL prefix searches are case-sensitive.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Genre)
@@ -8,6 +19,10 @@ class GenreAdmin(admin.ModelAdmin):
     list_display = (
         'name',
     )
+    search_fields = (
+        'name__startswith',
+        'slug__exact'
+    )
 
 
 @admin.register(Category)
@@ -15,10 +30,14 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = (
         'name',
     )
+    search_fields = (
+        'name__startswith',
+        'slug__exact'
+    )
 
 
 @admin.register(Title)
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(LargeTableAdmin):
     list_display = (
         'name',
         'year',
@@ -30,19 +49,34 @@ class TitleAdmin(admin.ModelAdmin):
     )
     list_filter = (
         'category',
+    )
+    list_select_related = (
+        'category',
+    )
+    autocomplete_fields = (
+        'category',
         'genre'
     )
+    readonly_fields = (
+        'pending_deletion',
+        'review_count'
+    )
+    search_fields = (
+        'name__startswith',
+    )
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(admin.ModelAdmin):
+class CustomUserAdmin(LargeTableAdmin):
     list_display = (
         'username',
         'first_name',
         'last_name',
         'email',
         'role',
-        'bio'
+        'bio',
+        'review_count',
+        'comment_count'
     )
     list_edit = (
         'role',
@@ -50,8 +84,55 @@ class CustomUserAdmin(admin.ModelAdmin):
         'last_name',
         'bio',
     )
+    list_filter = (
+        'role',
+    )
+    readonly_fields = (
+        'pending_deletion',
+        'review_count',
+        'comment_count',
+        'score_sum'
+    )
     search_fields = (
-        'email',
-        'username',
-        'role'
+        'email__exact',
+        'username__startswith'
+    )
+
+
+@admin.register(Review)
+class ReviewAdmin(LargeTableAdmin):
+    list_display = (
+        'pk',
+        'title',
+        'author',
+        'score',
+        'pub_date',
+        'is_hidden'
+    )
+    list_select_related = (
+        'title',
+        'author'
+    )
+    raw_id_fields = (
+        'title',
+        'author'
+    )
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    list_display = (
+        'pk',
+        'review',
+        'author',
+        'pub_date',
+        'is_hidden'
+    )
+    list_select_related = (
+        'review',
+        'author'
+    )
+    raw_id_fields = (
+        'review',
+        'author'
     )
@@ -0,0 +1,79 @@
+from .models import (DELETE, UPDATE, Category, ChangeLogEntry, Comment,
+                     Genre, Review, Title)
+
+TRACKED_MODELS = (Title, Genre, Category, Review, Comment)
+
+CHANGELOG_BATCH_SIZE = 1000
+
+
+def entry_for(instance, action):
+    """Builds a change log entry for a tracked object."""
+    entry = ChangeLogEntry(
+        model=instance._meta.model_name,
+        object_id=str(instance.pk),
+        action=action,
+    )
+    if isinstance(instance, (Genre, Category)):
+        entry.object_id = instance.slug
+    elif isinstance(instance, Review):
+        entry.title_id = instance.title_id
+    elif isinstance(instance, Comment):
+        entry.title_id = instance.review.title_id
+        entry.review_id = instance.review_id
+    return entry
+
+
+def record(instance, action):
+    entry_for(instance, action).save()
+
+
+def record_title_updates(titles):
+    """
+    Writes update events for titles whose payload changed without
+    a save of the title: rating, category or genres.
+    """
+    ChangeLogEntry.objects.bulk_create(
+        (
+            ChangeLogEntry(
+                model=Title._meta.model_name,
+                object_id=str(pk),
+                action=UPDATE,
+            )
+            for pk in titles.order_by('pk').values_list(
+                'pk', flat=True).distinct().iterator()
+        ),
+        batch_size=CHANGELOG_BATCH_SIZE
+    )
+
+
+def record_deletions(queryset):
+    """
+    Writes tombstones for reviews or comments about to be bulk deleted
+    or hidden, and title updates for ratings that change with them.
+    """
+    queryset = queryset.order_by()
+    if queryset.model is Review:
+        record_title_updates(Title.objects.filter(
+            pk__in=queryset.filter(is_hidden=False).values('title')
+        ))
+    if queryset.model is Comment:
+        rows = queryset.values_list(
+            'pk', 'review__title_id', 'review_id').iterator()
+    else:
+        rows = (
+            (pk, title_id, None) for pk, title_id
+            in queryset.values_list('pk', 'title_id').iterator()
+        )
+    ChangeLogEntry.objects.bulk_create(
+        (
+            ChangeLogEntry(
+                model=queryset.model._meta.model_name,
+                object_id=str(pk),
+                title_id=title_id,
+                review_id=review_id,
+                action=DELETE,
+            )
+            for pk, title_id, review_id in rows
+        ),
+        batch_size=CHANGELOG_BATCH_SIZE
+    )
@@ -1,5 +1,15 @@
+BATCH_MAX_REQUESTS = 50
+
+CHANGE_FEED_MAX_LIMIT = 1000
+
+CHANGE_FEED_PAGE_SIZE = 100
+
+CHANGE_LOG_RETENTION_DAYS = 30
+
 EMAIL_MAX_LEN = 254
 
+ESTIMATED_COUNT_LIMIT = 10000
+
 MAX_LENGTH_CHARACTERS_1 = 150
 
 MAX_LENGTH_CHARACTERS_2 = 256
@@ -12,6 +22,14 @@ MAX_SCORE = 10
 
 MIN_SCORE = 1
 
+MULTI_GET_MAX_IDS = 100
+
+PURGE_CHUNK_SIZE = 1000
+
+SNAPSHOT_BATCH_SIZE = 2000
+
+SNAPSHOT_CHUNK_ROWS = 100000
+
 TITLE_NAME_MAX_LEN = 256
 
 USERNAME_MAX_LEN = 150
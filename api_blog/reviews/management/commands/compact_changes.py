@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reviews.constants import CHANGE_LOG_RETENTION_DAYS, PURGE_CHUNK_SIZE
+from reviews.models import ChangeLogEntry
+from reviews.services import purge_in_chunks, raw_delete
+
+
+class Command(BaseCommand):
+    help = 'Trims change log entries older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=CHANGE_LOG_RETENTION_DAYS,
+            help='Number of days of changes to keep.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=PURGE_CHUNK_SIZE,
+            help='Number of rows deleted per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted = purge_in_chunks(
+            ChangeLogEntry.objects.filter(created__lt=cutoff),
+            options['chunk_size'],
+            delete=raw_delete,
+        )
+        self.stdout.write(f'{deleted} change log entries deleted.')
@@ -0,0 +1,38 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import SNAPSHOT_CHUNK_ROWS
+from reviews.snapshot import dump
+
+
+class Command(BaseCommand):
+    help = (
+        'Streams users, categories, genres, titles, reviews and comments '
+        'into a directory of gzipped NDJSON chunks. All tables are read '
+        'from one transaction snapshot.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Snapshot directory.')
+        parser.add_argument(
+            '--jobs', type=int, default=1,
+            help='Number of tables dumped in parallel '
+                 '(PostgreSQL only).'
+        )
+        parser.add_argument(
+            '--chunk-rows', type=int, default=SNAPSHOT_CHUNK_ROWS,
+            help='Number of rows per chunk file.'
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        tables = dump(
+            options['directory'], options['jobs'], options['chunk_rows']
+        )
+        for label, table in tables.items():
+            self.stdout.write(
+                f'{label}: {table["rows"]} rows, '
+                f'{len(table["chunks"])} chunks'
+            )
+        self.stdout.write(f'Dumped in {perf_counter() - start:.1f} s.')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import PURGE_CHUNK_SIZE
+from reviews.models import CustomUser, Title
+from reviews.services import purge, title_descendants, user_descendants
+
+
+class Command(BaseCommand):
+    help = 'Purges titles and users marked for deletion in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=PURGE_CHUNK_SIZE,
+            help='Number of rows deleted per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        for model, descendants in ((Title, title_descendants),
+                                   (CustomUser, user_descendants)):
+            for obj in model.objects.filter(pending_deletion=True).iterator():
+                deleted = purge(obj, descendants, chunk_size)
+                self.stdout.write(
+                    f'{model._meta.verbose_name} "{obj}": '
+                    f'{deleted} related rows deleted.'
+                )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.stats import recount
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized review and comment counters.'
+
+    def handle(self, *args, **options):
+        recount()
+        self.stdout.write('Counters recomputed.')
@@ -0,0 +1,32 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.snapshot import non_empty_tables, restore
+
+
+class Command(BaseCommand):
+    help = (
+        'Restores a snapshot written by dump_snapshot into empty tables '
+        'with bulk inserts and deferred constraint checks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Snapshot directory.')
+        parser.add_argument(
+            '--jobs', type=int, default=1,
+            help='Number of tables restored in parallel '
+                 '(ignored on SQLite).'
+        )
+
+    def handle(self, *args, **options):
+        tables = non_empty_tables()
+        if tables:
+            raise CommandError(
+                f'Tables must be empty before a restore: {", ".join(tables)}.'
+            )
+        start = perf_counter()
+        counts = restore(options['directory'], options['jobs'])
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count} rows')
+        self.stdout.write(f'Restored in {perf_counter() - start:.1f} s.')
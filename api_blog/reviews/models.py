@@ -18,8 +18,36 @@ ROLES = [
     (MODERATOR, MODERATOR),
 ]
 
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
 
-class CustomUser(AbstractUser):
+ACTIONS = [
+    (CREATE, CREATE),
+    (UPDATE, UPDATE),
+    (DELETE, DELETE),
+]
+
+
+class ManagedFieldsMixin:
+    """
+    Leaves fields maintained by targeted UPDATEs out of full saves,
+    so a stale instance never overwrites concurrent changes to them.
+    """
+    managed_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.managed_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class CustomUser(ManagedFieldsMixin, AbstractUser):
     username_validator = UnicodeUsernameValidator()
 
     username = models.CharField(
@@ -54,11 +82,44 @@ class CustomUser(AbstractUser):
         'Bio',
         blank=True
     )
+    pending_deletion = models.BooleanField(
+        'Pending deletion',
+        default=False
+    )
+    review_count = models.PositiveIntegerField(
+        'Reviews',
+        default=0
+    )
+    comment_count = models.PositiveIntegerField(
+        'Comments',
+        default=0
+    )
+    score_sum = models.PositiveIntegerField(
+        'Sum of given scores',
+        default=0
+    )
+
+    managed_fields = (
+        'pending_deletion', 'review_count', 'comment_count', 'score_sum'
+    )
 
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['pending_deletion'],
+                condition=models.Q(pending_deletion=True),
+                name='user_pending_deletion_idx'
+            ),
+            models.Index(
+                fields=['review_count'], name='user_review_count_idx'
+            ),
+            models.Index(
+                fields=['comment_count'], name='user_comment_count_idx'
+            ),
+        ]
 
     @property
     def is_user(self):
@@ -72,11 +133,17 @@ class CustomUser(AbstractUser):
     def is_admin(self):
         return self.role == ADMIN or self.is_superuser or self.is_staff
 
+    @property
+    def average_score(self):
+        if not self.review_count:
+            return None
+        return self.score_sum / self.review_count
+
     def __str__(self):
         return self.username
 
 
-class Title(models.Model):
+class Title(ManagedFieldsMixin, models.Model):
     name = models.CharField(
         verbose_name='Name', max_length=MAX_LENGTH_CHARACTERS_2
     )
@@ -93,12 +160,39 @@ class Title(models.Model):
         blank=True,
         null=True,
         related_name='title',
-        verbose_name='Category')
+        verbose_name='Category',
+        db_index=False)
+    pending_deletion = models.BooleanField(
+        verbose_name='Pending deletion', default=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Reviews', default=0
+    )
+
+    managed_fields = ('pending_deletion', 'review_count')
 
     class Meta:
         verbose_name = 'Work'
         verbose_name_plural = 'Works'
-        ordering = ['-id']
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(
+                fields=['name'], name='title_name_pattern_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+            models.Index(fields=['year', 'id'], name='title_year_idx'),
+            # Replaces the foreign key index: it serves category
+            # lookups and pages of a category in id order.
+            models.Index(
+                fields=['category', 'id'], name='title_category_idx'
+            ),
+            models.Index(
+                fields=['pending_deletion'],
+                condition=models.Q(pending_deletion=True),
+                name='title_pending_deletion_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -161,10 +255,19 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Publication date', auto_now_add=True, db_index=True
     )
+    is_hidden = models.BooleanField(
+        verbose_name='Hidden by moderator', default=False
+    )
 
     class Meta:
         verbose_name = 'review'
         verbose_name_plural = 'reviews'
+        ordering = ['pub_date', 'id']
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date'], name='review_title_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -172,6 +275,13 @@ class Review(models.Model):
             )
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_is_hidden = instance.__dict__.get('is_hidden')
+        return instance
+
     def __str__(self):
         return self.text[:MAX_LIMIT_CHARACTERS]
 
@@ -189,10 +299,56 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Add date', auto_now_add=True
     )
+    is_hidden = models.BooleanField(
+        verbose_name='Hidden by moderator', default=False
+    )
 
     class Meta:
         verbose_name = 'comment'
         verbose_name_plural = 'Comments'
+        ordering = ['pub_date', 'id']
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date'], name='comment_review_date_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_hidden = instance.__dict__.get('is_hidden')
+        return instance
 
     def __str__(self):
         return self.text[:MAX_LIMIT_CHARACTERS]
+
+
+class ChangeLogEntry(models.Model):
+    """Change of a catalog or review object, read by sync clients."""
+    model = models.CharField(
+        verbose_name='Model', max_length=MAX_LENGTH_CHARACTERS_3
+    )
+    object_id = models.CharField(
+        verbose_name='Object id', max_length=MAX_LENGTH_CHARACTERS_3
+    )
+    title_id = models.PositiveBigIntegerField(
+        verbose_name='Title id', blank=True, null=True
+    )
+    review_id = models.PositiveBigIntegerField(
+        verbose_name='Review id', blank=True, null=True
+    )
+    action = models.CharField(
+        verbose_name='Action', choices=ACTIONS,
+        max_length=MAX_LENGTH_CHARACTERS_3
+    )
+    created = models.DateTimeField(
+        verbose_name='Created', auto_now_add=True, db_index=True
+    )
+
+    class Meta:
+        verbose_name = 'change'
+        verbose_name_plural = 'Changes'
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.action} {self.model} {self.object_id}'
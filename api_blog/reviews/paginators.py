@@ -0,0 +1,28 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .constants import ESTIMATED_COUNT_LIMIT
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs a full COUNT(*).
+    Unfiltered PostgreSQL tables use the planner estimate,
+    everything else is counted up to ESTIMATED_COUNT_LIMIT rows.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if not queryset.query.where and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_LIMIT:
+                return int(row[0])
+        return queryset.order_by()[:ESTIMATED_COUNT_LIMIT].count()
@@ -0,0 +1,213 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .changelog import record_deletions
+from .constants import PURGE_CHUNK_SIZE
+from .models import Comment, Review
+from .stats import discount, touch_counts
+
+
+def raw_delete(queryset):
+    """Deletes rows with a single DELETE, bypassing the collector."""
+    return queryset._raw_delete(queryset.db)
+
+
+def title_descendants(title):
+    """Reviews and comments removed together with the title."""
+    return (
+        Comment.objects.filter(review__title=title),
+        Review.objects.filter(title=title),
+    )
+
+
+def user_descendants(user):
+    """Reviews and comments removed together with the user."""
+    return (
+        Comment.objects.filter(Q(author=user) | Q(review__author=user)),
+        Review.objects.filter(author=user),
+    )
+
+
+def should_defer(comments, reviews):
+    """
+    Checks whether the graph is too large to delete in the request.
+    Both counts stop just past the threshold.
+    """
+    threshold = settings.BULK_DELETE_DEFER_THRESHOLD
+    review_count = reviews.order_by()[:threshold + 1].count()
+    if review_count > threshold:
+        return True
+    remaining = threshold - review_count
+    return comments.order_by()[:remaining + 1].count() > remaining
+
+
+def lock_ids(queryset):
+    """
+    Locks the selected rows and returns their ids, so that later
+    statements touch exactly these rows. Call inside a transaction.
+    """
+    return list(queryset.select_for_update(of=('self',)).order_by(
+        'pk').values_list('pk', flat=True))
+
+
+def chunked(ids, size=PURGE_CHUNK_SIZE):
+    """Splits a list of ids into lists of at most 'size' ids."""
+    return (ids[start:start + size] for start in range(0, len(ids), size))
+
+
+def bulk_delete(queryset):
+    """
+    Deletes reviews or comments with set-based statements,
+    keeping the change log and the counters consistent.
+    """
+    deleted = 0
+    with transaction.atomic():
+        for chunk in chunked(lock_ids(queryset)):
+            rows = queryset.model.objects.filter(pk__in=chunk)
+            record_deletions(rows)
+            discount(rows)
+            deleted += raw_delete(rows)
+    touch_counts(queryset.model)
+    return deleted
+
+
+def hide(queryset):
+    """
+    Hides visible reviews or comments with set-based statements,
+    keeping the change log and the counters consistent.
+    """
+    hidden = 0
+    with transaction.atomic():
+        for chunk in chunked(lock_ids(queryset.filter(is_hidden=False))):
+            rows = queryset.model.objects.filter(pk__in=chunk)
+            record_deletions(rows)
+            discount(rows)
+            hidden += rows.update(is_hidden=True)
+    touch_counts(queryset.model)
+    return hidden
+
+
+def delete_descendants(comments, reviews):
+    """Removes comments, then reviews, with set-based statements."""
+    bulk_delete(comments)
+    bulk_delete(reviews)
+
+
+def delete_review(review):
+    """Deletes the review without loading its comments."""
+    with transaction.atomic():
+        bulk_delete(review.comments.all())
+        review.delete()
+
+
+def delete_title(title, defer=None):
+    """
+    Deletes the title with its reviews and comments.
+    Large graphs are only marked and left to 'purge_deleted';
+    their rows leave the counters with two set-based UPDATEs.
+    """
+    comments, reviews = title_descendants(title)
+    if defer is None:
+        defer = should_defer(comments, reviews)
+    if defer:
+        with transaction.atomic():
+            discount(comments)
+            discount(reviews)
+            title.pending_deletion = True
+            title.save(update_fields=('pending_deletion',))
+        return
+    with transaction.atomic():
+        delete_descendants(comments, reviews)
+        title.delete()
+
+
+def delete_user(user, defer=None):
+    """
+    Deletes the user with their reviews and comments.
+    Large graphs are only marked and left to 'purge_deleted';
+    reads skip the content of pending authors meanwhile.
+    """
+    comments, reviews = user_descendants(user)
+    if defer is None:
+        defer = should_defer(comments, reviews)
+    if defer:
+        user.pending_deletion = True
+        user.is_active = False
+        user.save(update_fields=('pending_deletion', 'is_active'))
+        touch_counts(Comment, Review)
+        return
+    with transaction.atomic():
+        delete_descendants(comments, reviews)
+        user.delete()
+
+
+def purge_in_chunks(queryset, chunk_size=PURGE_CHUNK_SIZE,
+                    delete=bulk_delete):
+    """Deletes the queryset rows in short transactions."""
+    deleted = 0
+    ids = queryset.order_by().values_list('pk', flat=True)
+    while True:
+        chunk = list(ids[:chunk_size])
+        if not chunk:
+            return deleted
+        with transaction.atomic():
+            deleted += delete(queryset.model.objects.filter(pk__in=chunk))
+
+
+def purge(obj, descendants, chunk_size=PURGE_CHUNK_SIZE):
+    """Purges a marked title or user and everything below it."""
+    comments, reviews = descendants(obj)
+    deleted = purge_in_chunks(comments, chunk_size)
+    deleted += purge_in_chunks(reviews, chunk_size)
+    with transaction.atomic():
+        obj.delete()
+    return deleted
+
+
+def select_for_moderation(model, ids=None, author=None, text=None,
+                          since=None, until=None):
+    """Reviews or comments matching all the given criteria."""
+    queryset = model.objects.all()
+    if ids:
+        queryset = queryset.filter(pk__in=ids)
+    if author is not None:
+        queryset = queryset.filter(author=author)
+    if text:
+        queryset = queryset.filter(text__icontains=text)
+    if since is not None:
+        queryset = queryset.filter(pub_date__gte=since)
+    if until is not None:
+        queryset = queryset.filter(pub_date__lt=until)
+    return queryset
+
+
+def moderate_delete(queryset):
+    """
+    Deletes the selected reviews or comments in one transaction.
+    Returns the number of deleted reviews and comments.
+    """
+    with transaction.atomic():
+        if queryset.model is Comment:
+            return {'reviews': 0, 'comments': bulk_delete(queryset)}
+        affected = {'reviews': 0, 'comments': 0}
+        for chunk in chunked(lock_ids(queryset)):
+            affected['comments'] += bulk_delete(
+                Comment.objects.filter(review_id__in=chunk)
+            )
+            affected['reviews'] += bulk_delete(
+                Review.objects.filter(pk__in=chunk)
+            )
+        return affected
+
+
+def moderate_hide(queryset):
+    """
+    Hides the selected reviews or comments in one transaction.
+    Returns the number of newly hidden reviews and comments.
+    """
+    with transaction.atomic():
+        hidden = hide(queryset)
+    if queryset.model is Comment:
+        return {'reviews': 0, 'comments': hidden}
+    return {'reviews': hidden, 'comments': 0}
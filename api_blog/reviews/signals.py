@@ -0,0 +1,140 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .changelog import TRACKED_MODELS, record, record_title_updates
+from .models import (CREATE, DELETE, UPDATE, Category, Comment,
+                     CustomUser, Genre, Review, Title)
+from .stats import change_counters, touch_counts
+
+
+def track(signal, dispatch_uid):
+    """Connects the handler to every model of the change log."""
+    def decorator(handler):
+        for model in TRACKED_MODELS:
+            signal.connect(
+                handler, sender=model, dispatch_uid=dispatch_uid
+            )
+        return handler
+    return decorator
+
+
+@track(post_save, dispatch_uid='count_version_save')
+def touch_counts_on_save(sender, instance, created, update_fields,
+                         **kwargs):
+    """
+    Creates and deferred deletes change list counts; other edits
+    are picked up when the cached counts time out.
+    """
+    if created or 'pending_deletion' in (update_fields or ()):
+        touch_counts(sender)
+
+
+@track(post_delete, dispatch_uid='count_version_delete')
+def touch_counts_on_delete(sender, instance, **kwargs):
+    touch_counts(sender)
+
+
+@receiver(pre_save, sender=Genre)
+@receiver(pre_save, sender=Category)
+def record_slug_change(sender, instance, **kwargs):
+    """Objects looked up by slug disappear under the old slug."""
+    if instance.pk is None:
+        return
+    old_slug = sender.objects.filter(pk=instance.pk).values_list(
+        'slug', flat=True).first()
+    if old_slug is not None and old_slug != instance.slug:
+        record(sender(pk=instance.pk, slug=old_slug), DELETE)
+
+
+@track(post_save, dispatch_uid='changelog_save')
+def record_save(sender, instance, created, **kwargs):
+    if created:
+        action = CREATE
+    elif getattr(instance, 'pending_deletion', False):
+        action = DELETE
+    else:
+        action = UPDATE
+    record(instance, action)
+    if sender is Review:
+        record(Title(pk=instance.title_id), UPDATE)
+
+
+@track(post_delete, dispatch_uid='changelog_delete')
+def record_delete(sender, instance, **kwargs):
+    record(instance, DELETE)
+    if sender is Review and not instance.is_hidden:
+        record(Title(pk=instance.title_id), UPDATE)
+
+
+@receiver(pre_delete, sender=Category)
+def record_category_titles(sender, instance, **kwargs):
+    """Titles of a deleted category lose it without being saved."""
+    record_title_updates(Title.objects.filter(category=instance))
+
+
+@receiver(pre_delete, sender=Genre)
+def record_genre_titles(sender, instance, **kwargs):
+    """Genre links are deleted without m2m_changed."""
+    record_title_updates(Title.objects.filter(genre=instance))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def record_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    """Changing the genres of a title updates the title."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        record(instance, UPDATE)
+        return
+    for title in Title.objects.filter(pk__in=pk_set or ()):
+        record(title, UPDATE)
+
+
+def counted_before(instance, created):
+    """Whether the saved review or comment was counted before the save."""
+    if created:
+        return False
+    return not getattr(instance, '_loaded_is_hidden', instance.is_hidden)
+
+
+@receiver(post_save, sender=Review)
+def count_review(sender, instance, created, **kwargs):
+    """Only visible reviews are counted."""
+    was_counted = counted_before(instance, created)
+    is_counted = not instance.is_hidden
+    count = is_counted - was_counted
+    score = (instance.score if is_counted else 0) - (
+        getattr(instance, '_loaded_score', instance.score)
+        if was_counted else 0
+    )
+    if count or score:
+        change_counters(CustomUser, instance.author_id,
+                        review_count=count, score_sum=score)
+    if count:
+        change_counters(Title, instance.title_id, review_count=count)
+    instance._loaded_score = instance.score
+    instance._loaded_is_hidden = instance.is_hidden
+
+
+@receiver(post_delete, sender=Review)
+def uncount_review(sender, instance, **kwargs):
+    if not instance.is_hidden:
+        change_counters(CustomUser, instance.author_id, review_count=-1,
+                        score_sum=-instance.score)
+        change_counters(Title, instance.title_id, review_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, **kwargs):
+    """Only visible comments are counted."""
+    count = (not instance.is_hidden) - counted_before(instance, created)
+    if count:
+        change_counters(CustomUser, instance.author_id, comment_count=count)
+    instance._loaded_is_hidden = instance.is_hidden
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    if not instance.is_hidden:
+        change_counters(CustomUser, instance.author_id, comment_count=-1)
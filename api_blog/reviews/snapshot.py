@@ -0,0 +1,215 @@
+import datetime
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections, transaction
+
+from .constants import SNAPSHOT_BATCH_SIZE, SNAPSHOT_CHUNK_ROWS
+from .models import Category, Comment, CustomUser, Genre, Review, Title
+
+# Tables of one level only reference tables of earlier levels,
+# so a level can be restored in parallel once the previous one is done.
+SNAPSHOT_LEVELS = (
+    (CustomUser, Category, Genre),
+    (Title,),
+    (Title.genre.through, Review),
+    (Comment,),
+)
+
+MANIFEST = 'manifest.json'
+
+
+class SnapshotEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision of datetimes and times."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def columns_of(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def in_thread(function):
+    """Closes the connections a worker thread opened."""
+    def wrapper(model):
+        try:
+            return function(model)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+def run_levels(function, jobs):
+    """
+    Calls the function for every model, level by level,
+    running the tables of a level in up to 'jobs' threads.
+    """
+    results = {}
+    for level in SNAPSHOT_LEVELS:
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for model, result in zip(
+                        level, executor.map(in_thread(function), level)):
+                    results[model._meta.label_lower] = result
+        else:
+            for model in level:
+                results[model._meta.label_lower] = function(model)
+    return results
+
+
+def dump_table(model, directory, chunk_rows=SNAPSHOT_CHUNK_ROWS):
+    """Streams the table into gzipped NDJSON chunks of chunk_rows rows."""
+    label = model._meta.label_lower
+    columns = columns_of(model)
+    encoder = SnapshotEncoder(ensure_ascii=False)
+    rows = model._base_manager.order_by('pk').values_list(
+        *columns).iterator(chunk_size=SNAPSHOT_BATCH_SIZE)
+    chunks = []
+    count = 0
+    file = None
+    for row in rows:
+        if count % chunk_rows == 0:
+            if file is not None:
+                file.close()
+            chunks.append(f'{label}.{len(chunks):05d}.ndjson.gz')
+            file = gzip.open(
+                os.path.join(directory, chunks[-1]), 'wt',
+                encoding='utf-8', compresslevel=6
+            )
+        file.write(encoder.encode(row))
+        file.write('\n')
+        count += 1
+    if file is not None:
+        file.close()
+    return {'columns': columns, 'chunks': chunks, 'rows': count}
+
+
+@contextmanager
+def snapshot_transaction(snapshot=None):
+    """
+    Reads of the block see one snapshot of the database: a REPEATABLE
+    READ transaction on PostgreSQL, importing the exported 'snapshot'
+    when given. One SQLite transaction reads a single state already.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ '
+                    'READ ONLY'
+                )
+                if snapshot is not None:
+                    cursor.execute('SET TRANSACTION SNAPSHOT %s', [snapshot])
+        yield
+
+
+def export_snapshot():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_export_snapshot()')
+        return cursor.fetchone()[0]
+
+
+def dump(directory, jobs=1, chunk_rows=SNAPSHOT_CHUNK_ROWS):
+    """
+    Writes every snapshot table and the manifest into the directory.
+    All tables are read in one transaction; parallel jobs import its
+    snapshot, so only PostgreSQL dumps with more than one job.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if connection.vendor != 'postgresql':
+        jobs = 1
+    with snapshot_transaction():
+        snapshot = export_snapshot() if jobs > 1 else None
+
+        def dump_model(model):
+            if snapshot is None:
+                return dump_table(model, directory, chunk_rows)
+            with snapshot_transaction(snapshot):
+                return dump_table(model, directory, chunk_rows)
+
+        tables = run_levels(dump_model, jobs)
+    with open(os.path.join(directory, MANIFEST), 'w') as file:
+        json.dump({'version': 1, 'tables': tables}, file, indent=2)
+    return tables
+
+
+def read_rows(directory, chunks):
+    for chunk in chunks:
+        with gzip.open(os.path.join(directory, chunk), 'rt',
+                       encoding='utf-8') as file:
+            for line in file:
+                yield json.loads(line)
+
+
+def insert(model, fields, objs):
+    """
+    Inserts the rows as they are: raw mode keeps the dumped values
+    of auto_now fields and sends no signals, as loaddata does.
+    """
+    size = connection.ops.bulk_batch_size(fields, objs) or len(objs)
+    for start in range(0, len(objs), size):
+        model._base_manager._insert(
+            objs[start:start + size], fields=fields, raw=True
+        )
+
+
+def restore_table(model, directory, table):
+    """Bulk inserts the table in batches with constraint checks deferred."""
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    columns = table['columns']
+    insert_fields = [fields[column] for column in columns]
+    converters = [field.to_python for field in insert_fields]
+    count = 0
+    batch = []
+    with transaction.atomic():
+        with connection.constraint_checks_disabled():
+            for row in read_rows(directory, table['chunks']):
+                batch.append(model(**{
+                    column: convert(value) for column, convert, value
+                    in zip(columns, converters, row)
+                }))
+                if len(batch) == SNAPSHOT_BATCH_SIZE:
+                    insert(model, insert_fields, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                insert(model, insert_fields, batch)
+                count += len(batch)
+        connection.check_constraints(table_names=[model._meta.db_table])
+    return count
+
+
+def restore(directory, jobs=1):
+    """Loads a snapshot written by dump() into empty tables."""
+    with open(os.path.join(directory, MANIFEST)) as file:
+        tables = json.load(file)['tables']
+    if connection.vendor == 'sqlite':
+        jobs = 1
+
+    counts = run_levels(
+        lambda model: restore_table(
+            model, directory, tables[model._meta.label_lower]
+        ),
+        jobs
+    )
+    models = [model for level in SNAPSHOT_LEVELS for model in level]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    return counts
+
+
+def non_empty_tables():
+    return [
+        model._meta.label_lower
+        for level in SNAPSHOT_LEVELS for model in level
+        if model._base_manager.exists()
+    ]
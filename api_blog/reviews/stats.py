@@ -0,0 +1,85 @@
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Comment, CustomUser, Review, Title
+
+
+def change_counters(model, pk, **deltas):
+    """Applies counter deltas to a single row in one UPDATE."""
+    model.objects.filter(pk=pk).update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+
+
+def count_version_key(model):
+    return f'count-version:{model._meta.label_lower}'
+
+
+def touch_counts(*models):
+    """
+    Gives the models a new count version, so list counts cached
+    for them before the change are recomputed.
+    """
+    cache.set_many({
+        count_version_key(model): uuid.uuid4().hex for model in models
+    }, None)
+
+
+def per_row(queryset, field, aggregate):
+    """Correlated subquery with the aggregate of the outer row's rows."""
+    return Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+            field).annotate(total=aggregate).values('total')
+    )
+
+
+def counted(queryset):
+    """Rows of the queryset that the counters include."""
+    if queryset.model is Comment:
+        return queryset.filter(
+            is_hidden=False, review__title__pending_deletion=False
+        )
+    return queryset.filter(is_hidden=False, title__pending_deletion=False)
+
+
+def discount(queryset):
+    """
+    Removes reviews or comments about to be bulk deleted or hidden
+    from the counters. Hidden rows and rows of pending titles
+    are already discounted.
+    """
+    queryset = counted(queryset).order_by()
+    authors = CustomUser.objects.filter(pk__in=queryset.values('author'))
+    if queryset.model is Comment:
+        authors.update(
+            comment_count=F('comment_count')
+            - per_row(queryset, 'author', Count('pk'))
+        )
+        return
+    authors.update(
+        review_count=F('review_count')
+        - per_row(queryset, 'author', Count('pk')),
+        score_sum=F('score_sum')
+        - per_row(queryset, 'author', Sum('score')),
+    )
+    Title.objects.filter(pk__in=queryset.values('title')).update(
+        review_count=F('review_count')
+        - per_row(queryset, 'title', Count('pk'))
+    )
+
+
+def recount():
+    """Recomputes every counter from the counted reviews and comments."""
+    reviews = counted(Review.objects.all())
+    comments = counted(Comment.objects.all())
+    CustomUser.objects.update(
+        review_count=Coalesce(per_row(reviews, 'author', Count('pk')), 0),
+        comment_count=Coalesce(per_row(comments, 'author', Count('pk')), 0),
+        score_sum=Coalesce(per_row(reviews, 'author', Sum('score')), 0),
+    )
+    Title.objects.update(
+        review_count=Coalesce(per_row(reviews, 'title', Count('pk')), 0),
+    )
@@ -0,0 +1,92 @@
+import pytest
+from rest_framework.test import APIClient
+
+from api import metrics
+
+from reviews.models import Category, Comment, CustomUser, Genre, Review, Title
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path, monkeypatch):
+    """Keeps the metric files of MetricsMiddleware out of the tree."""
+    settings.METRICS_DIR = str(tmp_path / 'metrics')
+    monkeypatch.setattr(metrics, '_store', None)
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create(
+        username='admin', email='admin@example.com', role='admin'
+    )
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create(
+        username='user', email='user@example.com'
+    )
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def user_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def admin_client(admin):
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.fixture
+def catalog():
+    """
+    Titles with and without a category and with zero to three genres,
+    reviewed by several authors, one review of each title hidden.
+    """
+    authors = [
+        CustomUser.objects.create(
+            username=f'author{index}', email=f'author{index}@example.com'
+        )
+        for index in range(4)
+    ]
+    categories = [
+        Category.objects.create(name=f'Category {index}', slug=f'cat{index}')
+        for index in range(2)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Genre {index}', slug=f'genre{index}')
+        for index in range(3)
+    ]
+    titles = []
+    for index in range(5):
+        title = Title.objects.create(
+            name=f'Title {index}', year=2000 + index,
+            description=f'Описание {index}',
+            category=categories[index % 2] if index != 4 else None,
+        )
+        title.genre.set(genres[:index % 4])
+        titles.append(title)
+    for title in titles[:4]:
+        for score, author in enumerate(authors, start=5):
+            review = Review.objects.create(
+                title=title, author=author, text=f'Review of {title.name}',
+                score=score, is_hidden=author == authors[-1],
+            )
+            for commenter in authors[:2]:
+                Comment.objects.create(
+                    review=review, author=commenter, text='Comment',
+                    is_hidden=commenter == authors[1] and score == 5,
+                )
+    return {
+        'authors': authors, 'categories': categories,
+        'genres': genres, 'titles': titles,
+    }
@@ -0,0 +1,28 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+PATHS = ('/api/v1/users/me/', '/api/v1/genres/', '/api/v1/titles/1/')
+
+
+@pytest.mark.parametrize('authenticated', (False, True))
+def test_batch_results_match_direct_calls(client, user_client, catalog,
+                                          authenticated):
+    api = user_client if authenticated else client
+    response = api.post(
+        '/api/v1/batch/', {'requests': list(PATHS)}, format='json'
+    )
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [result['path'] for result in results] == list(PATHS)
+    for path, result in zip(PATHS, results):
+        direct = api.get(path)
+        assert result['status'] == direct.status_code, path
+        assert result['body'] == direct.json(), path
+
+
+def test_anonymous_batch_gets_unauthorized_for_private_routes(client):
+    response = client.post(
+        '/api/v1/batch/', {'requests': ['/api/v1/users/me/']}, format='json'
+    )
+    assert response.json()['results'][0]['status'] == 401
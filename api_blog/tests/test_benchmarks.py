@@ -0,0 +1,104 @@
+from time import process_time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import ReviewFastSerializer, TitleFastSerializer
+from api.renderers import ORJSONRenderer
+from api.serializers import ReviewSerializer, TitleReadSerializer
+from api.views import TitleViewSet
+from reviews.models import Category, CustomUser, Genre, Review, Title
+
+ROWS = 500
+ROUNDS = 5
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+def cpu_time(function):
+    """Best CPU time of several rounds, in milliseconds."""
+    timings = []
+    for _ in range(ROUNDS):
+        start = process_time()
+        function()
+        timings.append(process_time() - start)
+    return min(timings) * 1000
+
+
+@pytest.fixture
+def large_catalog():
+    category = Category.objects.create(name='Films', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Genre {index}', slug=f'genre{index}')
+        for index in range(3)
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Title {index}', year=2000, category=category,
+              description='Description ' * 20)
+        for index in range(ROWS)
+    )
+    titles = list(Title.objects.all())
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title=title, genre=genre)
+        for title in titles for genre in genres
+    )
+    CustomUser.objects.bulk_create(
+        CustomUser(username=f'author{index}',
+                   email=f'author{index}@example.com')
+        for index in range(ROWS)
+    )
+    authors = list(CustomUser.objects.all())
+    Review.objects.bulk_create(
+        Review(title=titles[0], author=author, text='Review text ' * 20,
+               score=5)
+        for author in authors
+    )
+    return titles[0]
+
+
+def report(name, regular, fast):
+    print(f'\n{name}: serializer {regular:.1f} ms, '
+          f'fast path {fast:.1f} ms, x{regular / fast:.1f}')
+
+
+def test_title_list_cpu_time(large_catalog):
+    queryset = TitleViewSet.queryset.all()
+
+    def regular():
+        data = TitleReadSerializer(
+            queryset.prefetch_related('genre').select_related('category'),
+            many=True
+        ).data
+        JSONRenderer().render(data)
+
+    def fast():
+        serializer = TitleFastSerializer()
+        data = serializer.serialize(
+            queryset.values(*serializer.values_fields)
+        )
+        ORJSONRenderer().render(data)
+
+    regular_time, fast_time = cpu_time(regular), cpu_time(fast)
+    report('titles', regular_time, fast_time)
+    assert fast_time < regular_time
+
+
+def test_review_list_cpu_time(large_catalog):
+    queryset = large_catalog.reviews.filter(is_hidden=False)
+
+    def regular():
+        data = ReviewSerializer(
+            queryset.select_related('author'), many=True
+        ).data
+        JSONRenderer().render(data)
+
+    def fast():
+        serializer = ReviewFastSerializer()
+        data = serializer.serialize(
+            queryset.values(*serializer.values_fields)
+        )
+        ORJSONRenderer().render(data)
+
+    regular_time, fast_time = cpu_time(regular), cpu_time(fast)
+    report('reviews', regular_time, fast_time)
+    assert fast_time < regular_time
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import ChangeLogEntry, Review
+from reviews.services import hide
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def no_lag(settings):
+    settings.CHANGE_FEED_LAG_SECONDS = 0
+
+
+def title_updates(after):
+    return set(ChangeLogEntry.objects.filter(
+        pk__gt=after, model='title', action='update'
+    ).values_list('object_id', flat=True))
+
+
+def head():
+    return ChangeLogEntry.objects.order_by('-pk').values_list(
+        'pk', flat=True).first() or 0
+
+
+def test_category_delete_updates_its_titles(admin_client, catalog):
+    category = catalog['categories'][0]
+    titles = {str(title.pk) for title in catalog['titles']
+              if title.category_id == category.pk}
+    cursor = head()
+    response = admin_client.delete(f'/api/v1/categories/{category.slug}/')
+    assert response.status_code == 204
+    assert title_updates(cursor) == titles
+
+
+def test_genre_delete_updates_its_titles(admin_client, catalog):
+    genre = catalog['genres'][2]
+    cursor = head()
+    response = admin_client.delete(f'/api/v1/genres/{genre.slug}/')
+    assert response.status_code == 204
+    assert title_updates(cursor) == {str(catalog['titles'][3].pk)}
+
+
+def test_review_create_updates_title(user_client, catalog):
+    title = catalog['titles'][4]
+    cursor = head()
+    response = user_client.post(
+        f'/api/v1/titles/{title.pk}/reviews/', {'text': 'New', 'score': 7}
+    )
+    assert response.status_code == 201
+    assert title_updates(cursor) == {str(title.pk)}
+
+
+def test_hiding_reviews_updates_titles(catalog):
+    title = catalog['titles'][0]
+    cursor = head()
+    hide(Review.objects.filter(title=title))
+    assert title_updates(cursor) == {str(title.pk)}
+
+
+def test_trimmed_cursor_gets_gone(client, catalog, no_lag):
+    entries = list(
+        ChangeLogEntry.objects.order_by('pk').values_list('pk', flat=True)
+    )
+    ChangeLogEntry.objects.filter(pk__lte=entries[10]).delete()
+    response = client.get(f'/api/v1/changes/?since={entries[5]}')
+    assert response.status_code == 410
+    assert response.json()['cursor'] == entries[-1]
+
+    response = client.get(f'/api/v1/changes/?since={entries[10]}')
+    assert response.status_code == 200
+    assert response.json()['results'][0]['id'] == entries[11]
+
+
+def test_recent_entries_are_held_back(client, catalog, settings):
+    settings.CHANGE_FEED_LAG_SECONDS = 60
+    cursor = head()
+    ChangeLogEntry.objects.filter(pk__lte=cursor - 5).update(
+        created=timezone.now() - timedelta(minutes=5)
+    )
+    response = client.get('/api/v1/changes/?limit=1000')
+    assert response.status_code == 200
+    assert response.json()['cursor'] == cursor - 5
+
+    settings.CHANGE_FEED_LAG_SECONDS = 0
+    response = client.get(f'/api/v1/changes/?since={cursor - 5}')
+    assert [entry['id'] for entry in response.json()['results']] == list(
+        range(cursor - 4, cursor + 1)
+    )
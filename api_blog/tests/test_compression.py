@@ -0,0 +1,102 @@
+import gzip
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from api.middleware import CompressionMiddleware, negotiate_encoding
+
+BODY = json.dumps([{'name': 'Title', 'id': index} for index in range(100)])
+
+
+def compressed(response, accept_encoding='gzip'):
+    middleware = CompressionMiddleware(lambda request: response)
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    return middleware(request)
+
+
+def json_response(body=BODY):
+    return HttpResponse(body, content_type='application/json')
+
+
+@pytest.mark.parametrize('header, encoding', [
+    ('gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('gzip;q=0, *', None),
+    ('identity', None),
+    ('*', 'gzip'),
+    ('', None),
+])
+def test_negotiate_encoding(header, encoding, monkeypatch):
+    monkeypatch.setattr('api.middleware.brotli', None)
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+    assert negotiate_encoding(request) == encoding
+
+
+def test_small_response_varies_on_encoding(settings):
+    settings.COMPRESSION_MIN_SIZE = 1024
+    response = compressed(json_response('{}'))
+    assert response.content == b'{}'
+    assert not response.has_header('Content-Encoding')
+    assert response['Vary'] == 'Accept-Encoding'
+
+
+def test_large_response_is_gzipped(settings, monkeypatch):
+    monkeypatch.setattr('api.middleware.brotli', None)
+    settings.COMPRESSION_MIN_SIZE = 1024
+    assert len(BODY) >= 1024
+    response = compressed(json_response())
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Vary'] == 'Accept-Encoding'
+    assert response['Content-Length'] == str(len(response.content))
+    assert gzip.decompress(response.content).decode() == BODY
+
+
+def test_refused_gzip_gets_identity(settings):
+    settings.COMPRESSION_MIN_SIZE = 1024
+    response = compressed(json_response(), 'gzip;q=0')
+    assert not response.has_header('Content-Encoding')
+    assert response.content.decode() == BODY
+
+
+def test_encoded_and_streaming_responses_pass_through(settings):
+    settings.COMPRESSION_MIN_SIZE = 0
+    encoded = json_response()
+    encoded['Content-Encoding'] = 'identity'
+    response = compressed(encoded)
+    assert response['Content-Encoding'] == 'identity'
+    assert response.content.decode() == BODY
+
+    streaming = StreamingHttpResponse(
+        iter([BODY]), content_type='application/json'
+    )
+    response = compressed(streaming)
+    assert not response.has_header('Content-Encoding')
+    assert b''.join(response.streaming_content).decode() == BODY
+
+
+@pytest.mark.django_db
+def test_response_cache_keeps_bytes_per_encoding(client, catalog, settings,
+                                                 monkeypatch):
+    monkeypatch.setattr('api.middleware.brotli', None)
+    settings.RESPONSE_CACHE_TIMEOUT = 60
+    settings.COMPRESSION_MIN_SIZE = 0
+    cache.clear()
+    url = '/api/v1/titles/?limit=5'
+    first = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+    assert first['Content-Encoding'] == 'gzip'
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+    assert not any('reviews_title' in query['sql'] for query in queries)
+    assert cached['Content-Encoding'] == 'gzip'
+    assert cached.content == first.content
+
+    plain = client.get(url)
+    assert not plain.has_header('Content-Encoding')
+    assert json.loads(plain.content) == json.loads(
+        gzip.decompress(cached.content)
+    )
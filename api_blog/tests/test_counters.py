@@ -0,0 +1,51 @@
+import pytest
+
+from reviews.models import Comment, CustomUser, Review
+from reviews.stats import recount
+
+pytestmark = pytest.mark.django_db
+
+
+def counters():
+    return list(CustomUser.objects.order_by('pk').values_list(
+        'review_count', 'comment_count', 'score_sum'))
+
+
+def test_counters_match_recount(catalog):
+    review = Review.objects.filter(is_hidden=False).first()
+    review.is_hidden = True
+    review.save()
+    review.score = 1
+    review.is_hidden = False
+    review.save()
+    comment = Comment.objects.filter(is_hidden=True).first()
+    comment.is_hidden = False
+    comment.save()
+    incremental = counters()
+    recount()
+    assert counters() == incremental
+
+
+def test_stale_user_save_keeps_counters(catalog):
+    author = catalog['authors'][0]
+    stale = CustomUser.objects.get(pk=author.pk)
+    Review.objects.create(
+        title=catalog['titles'][4], author=author, text='New', score=10
+    )
+    stale.bio = 'Bio'
+    stale.save()
+    author.refresh_from_db()
+    assert author.bio == 'Bio'
+    assert author.review_count == stale.review_count + 1
+
+
+def test_patch_of_user_keeps_counters(catalog, admin_client):
+    author = CustomUser.objects.get(pk=catalog['authors'][0].pk)
+    review_count = author.review_count
+    response = admin_client.patch(
+        f'/api/v1/users/{author.username}/',
+        {'bio': 'Bio', 'review_count': 0}
+    )
+    assert response.status_code == 200
+    author.refresh_from_db()
+    assert author.review_count == review_count
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import ORJSONRenderer
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from api.views import TitleViewSet
+
+
+def as_json(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+@pytest.mark.django_db
+def test_title_list_matches_read_serializer(client, catalog):
+    response = client.get('/api/v1/titles/?limit=100')
+    assert response.status_code == 200
+    expected = TitleReadSerializer(
+        TitleViewSet.queryset.all(), many=True
+    ).data
+    assert response.json()['results'] == as_json(expected)
+
+
+@pytest.mark.django_db
+def test_title_list_covers_null_category_genres_and_hidden_reviews(
+        client, catalog):
+    results = {
+        title['id']: title
+        for title in client.get('/api/v1/titles/?limit=100').json()['results']
+    }
+    titles = catalog['titles']
+    assert results[titles[4].id]['category'] is None
+    assert len(results[titles[3].id]['genre']) == 3
+    # The hidden review scored 8, so the rating is the mean of 5, 6 and 7.
+    assert results[titles[0].id]['rating'] == 6
+    assert results[titles[4].id]['rating'] is None
+
+
+@pytest.mark.django_db
+def test_review_list_matches_serializer(client, catalog):
+    title = catalog['titles'][1]
+    response = client.get(f'/api/v1/titles/{title.id}/reviews/?limit=100')
+    assert response.status_code == 200
+    expected = ReviewSerializer(
+        title.reviews.filter(is_hidden=False), many=True
+    ).data
+    assert response.json()['results'] == as_json(expected)
+    assert len(expected) == 3
+
+
+@pytest.mark.django_db
+def test_comment_list_matches_serializer(client, catalog):
+    review = catalog['titles'][0].reviews.get(score=5)
+    response = client.get(
+        f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+        f'/comments/?limit=100'
+    )
+    assert response.status_code == 200
+    expected = CommentSerializer(
+        review.comments.filter(is_hidden=False), many=True
+    ).data
+    assert response.json()['results'] == as_json(expected)
+    assert len(expected) == 1
+
+
+@pytest.mark.django_db
+def test_orjson_and_stdlib_rendering_match(client, catalog, monkeypatch):
+    title = catalog['titles'][0]
+    urls = (
+        '/api/v1/titles/?limit=100',
+        f'/api/v1/titles/{title.id}/reviews/?limit=100',
+    )
+    with_orjson = [client.get(url).content for url in urls]
+    monkeypatch.setattr(renderers, 'orjson', None)
+    with_stdlib = [client.get(url).content for url in urls]
+    assert [json.loads(content) for content in with_orjson] == [
+        json.loads(content) for content in with_stdlib
+    ]
+
+
+@pytest.mark.skipif(renderers.orjson is None, reason='orjson is missing')
+def test_orjson_renderer_keeps_drf_datetime_format():
+    import datetime
+    value = datetime.datetime(2023, 1, 2, 3, 4, 5, 678901,
+                              tzinfo=datetime.timezone.utc)
+    data = {'pub_date': value, 'text': 'Ünïcode'}
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
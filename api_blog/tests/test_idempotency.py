@@ -0,0 +1,79 @@
+import hashlib
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.test.client import encode_multipart
+
+from api.checks import shared_cache_check
+from reviews.models import Review
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def test_retry_replays_stored_response(user_client, catalog):
+    url = f'/api/v1/titles/{catalog["titles"][4].pk}/reviews/'
+    data = {'text': 'Once', 'score': 8}
+    first = user_client.post(url, data, HTTP_IDEMPOTENCY_KEY='key-1')
+    retry = user_client.post(url, data, HTTP_IDEMPOTENCY_KEY='key-1')
+    assert first.status_code == retry.status_code == 201
+    assert retry['Idempotent-Replayed'] == 'true'
+    assert retry.json() == first.json()
+    assert Review.objects.filter(text='Once').count() == 1
+
+
+def test_reused_key_with_other_body_is_rejected(user_client, catalog):
+    url = f'/api/v1/titles/{catalog["titles"][4].pk}/reviews/'
+    user_client.post(url, {'text': 'A', 'score': 8},
+                     HTTP_IDEMPOTENCY_KEY='key-2')
+    response = user_client.post(url, {'text': 'B', 'score': 8},
+                                HTTP_IDEMPOTENCY_KEY='key-2')
+    assert response.status_code == 422
+
+
+def test_multipart_retry_with_new_boundary_is_replayed(user_client,
+                                                       catalog):
+    url = f'/api/v1/titles/{catalog["titles"][4].pk}/reviews/'
+    data = {'text': 'Multipart', 'score': '8'}
+    responses = [
+        user_client.generic(
+            'POST', url,
+            encode_multipart(boundary, data),
+            f'multipart/form-data; boundary={boundary}',
+            HTTP_IDEMPOTENCY_KEY='key-4',
+        )
+        for boundary in ('first-boundary', 'second-boundary')
+    ]
+    assert [response.status_code for response in responses] == [201, 201]
+    assert responses[1]['Idempotent-Replayed'] == 'true'
+    assert Review.objects.filter(text='Multipart').count() == 1
+
+
+def test_lock_held_by_another_worker_gets_conflict(user_client, user,
+                                                   catalog, settings):
+    url = f'/api/v1/titles/{catalog["titles"][4].pk}/reviews/'
+    digest = hashlib.sha256(f'{user.pk}:{url}:key-3'.encode()).hexdigest()
+    # A separate backend instance over the same table, like another worker.
+    other_worker = DatabaseCache(settings.CACHES['default']['LOCATION'], {})
+    assert other_worker.add(f'idempotency:{digest}:lock', True, 30)
+    response = user_client.post(url, {'text': 'A', 'score': 8},
+                                HTTP_IDEMPOTENCY_KEY='key-3')
+    assert response.status_code == 409
+
+
+def test_process_local_cache_is_reported(settings):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }}
+    assert [error.id for error in shared_cache_check(None)] == ['api.W001']
+
+
+def test_default_cache_is_shared():
+    assert shared_cache_check(None) == []
+    call_command('check', fail_level='WARNING')
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from api.metrics import MetricsStore
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, 'fork'), reason='Needs fork to run worker processes.'
+)
+
+
+def observe_in_child(store, route, times):
+    pid = os.fork()
+    if pid == 0:
+        for _ in range(times):
+            store.observe(route, 0.01, 1, 100)
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+
+def requests(store, route):
+    return store.collect()[store.offsets[route]]
+
+
+def test_files_of_exited_workers_are_archived(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    route = store.routes[0]
+    observe_in_child(store, route, 3)
+    observe_in_child(store, route, 2)
+    store.observe(route, 0.01, 1, 100)
+    assert len(list(tmp_path.glob('metrics_*.db'))) == 3
+
+    assert requests(store, route) == 6
+    files = sorted(path.name for path in tmp_path.glob('metrics_*.db'))
+    assert files == [
+        f'metrics_{store.layout}_{os.getpid()}.db',
+        f'metrics_{store.layout}_archive.db',
+    ]
+    assert requests(store, route) == 6
+
+    observe_in_child(store, route, 4)
+    assert requests(store, route) == 10
+
+
+def test_dead_files_of_other_layouts_are_removed(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    observe_in_child(store, store.routes[0], 1)
+    store.collect()
+    old = tmp_path / f'metrics_{store.layout}_archive.db'
+    old.rename(tmp_path / 'metrics_oldlayout_archive.db')
+    assert store.collect()[store.offsets[store.routes[0]]] == 0
+    assert list(tmp_path.glob('metrics_*.db')) == []
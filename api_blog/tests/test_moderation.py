@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, CustomUser, Review, Title
+from reviews.stats import recount
+
+pytestmark = pytest.mark.django_db
+
+URL = '/api/v1/moderation/'
+
+
+@pytest.fixture
+def moderator_client(django_user_model):
+    moderator = django_user_model.objects.create(
+        username='moderator', email='moderator@example.com',
+        role='moderator'
+    )
+    client = APIClient()
+    client.force_authenticate(moderator)
+    return client
+
+
+def counters():
+    return (
+        list(CustomUser.objects.order_by('pk').values_list(
+            'review_count', 'comment_count', 'score_sum')),
+        list(Title.objects.order_by('pk').values_list(
+            'review_count', flat=True)),
+    )
+
+
+def assert_counters_match_recount():
+    incremental = counters()
+    recount()
+    assert counters() == incremental
+
+
+def test_users_are_denied(client, user_client, catalog):
+    data = {'target': 'reviews', 'action': 'delete', 'text': 'Review'}
+    assert client.post(URL, data, format='json').status_code == 401
+    assert user_client.post(URL, data, format='json').status_code == 403
+    assert Review.objects.count() == 16
+
+
+def test_delete_reviews_by_ids(moderator_client, catalog):
+    ids = list(Review.objects.filter(
+        title=catalog['titles'][0]
+    ).order_by('pk').values_list('pk', flat=True)[:2])
+    response = moderator_client.post(URL, {
+        'target': 'reviews', 'action': 'delete', 'ids': ids,
+    }, format='json')
+    assert response.status_code == 200
+    assert response.json() == {'reviews': 2, 'comments': 4}
+    assert not Review.objects.filter(pk__in=ids).exists()
+    assert not Comment.objects.filter(review_id__in=ids).exists()
+    assert_counters_match_recount()
+
+
+def test_hide_comments_by_author(moderator_client, catalog):
+    author = catalog['authors'][1]
+    response = moderator_client.post(URL, {
+        'target': 'comments', 'action': 'hide', 'author': author.username,
+    }, format='json')
+    assert response.status_code == 200
+    # Four of the sixteen comments were hidden already.
+    assert response.json() == {'reviews': 0, 'comments': 12}
+    assert not Comment.objects.filter(
+        author=author, is_hidden=False).exists()
+    assert_counters_match_recount()
+
+
+def test_delete_reviews_by_text(moderator_client, catalog):
+    response = moderator_client.post(URL, {
+        'target': 'reviews', 'action': 'delete', 'text': 'of title 1',
+    }, format='json')
+    assert response.status_code == 200
+    assert response.json() == {'reviews': 4, 'comments': 8}
+    assert not Review.objects.filter(title=catalog['titles'][1]).exists()
+    assert_counters_match_recount()
+
+
+def test_hide_reviews_in_time_window(moderator_client, catalog):
+    Review.objects.filter(title=catalog['titles'][2]).update(
+        pub_date=datetime(2020, 1, 1, tzinfo=timezone.utc)
+    )
+    response = moderator_client.post(URL, {
+        'target': 'reviews', 'action': 'hide', 'text': 'Review',
+        'since': '2019-12-31T00:00:00Z', 'until': '2020-01-02T00:00:00Z',
+    }, format='json')
+    assert response.status_code == 200
+    assert response.json() == {'reviews': 3, 'comments': 0}
+    assert set(Review.objects.filter(is_hidden=False).values_list(
+        'title', flat=True)) == {
+        title.pk for title in catalog['titles'][:4]
+    } - {catalog['titles'][2].pk}
+    assert_counters_match_recount()
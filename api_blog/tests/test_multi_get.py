@@ -0,0 +1,53 @@
+import pytest
+
+from reviews.constants import MULTI_GET_MAX_IDS
+from reviews.models import Review
+
+pytestmark = pytest.mark.django_db
+
+
+def test_titles_keep_requested_order(client, catalog):
+    ids = [title.pk for title in catalog['titles']][::-1]
+    response = client.get(
+        '/api/v1/titles/', {'ids': ','.join(map(str, ids))})
+    assert response.status_code == 200
+    assert [title['id'] for title in response.json()] == ids
+
+
+def test_reviews_keep_requested_order(client, catalog):
+    title = catalog['titles'][0]
+    ids = list(Review.objects.filter(
+        title=title, is_hidden=False
+    ).order_by('-pk').values_list('pk', flat=True))
+    response = client.get(
+        f'/api/v1/titles/{title.pk}/reviews/',
+        {'ids': ','.join(map(str, ids))}
+    )
+    assert response.status_code == 200
+    assert [review['id'] for review in response.json()] == ids
+
+
+def test_genres_take_slugs(client, catalog):
+    slugs = [genre.slug for genre in catalog['genres']][::-1]
+    response = client.get('/api/v1/genres/', {'ids': ','.join(slugs)})
+    assert response.status_code == 200
+    assert [genre['slug'] for genre in response.json()] == slugs
+
+
+def test_too_many_ids_are_rejected(client, catalog):
+    ids = ','.join(map(str, range(1, MULTI_GET_MAX_IDS + 2)))
+    response = client.get('/api/v1/titles/', {'ids': ids})
+    assert response.status_code == 400
+    assert 'ids' in response.json()
+
+
+def test_non_integer_ids_are_rejected(client, catalog):
+    response = client.get('/api/v1/titles/', {'ids': '1,abc'})
+    assert response.status_code == 400
+    assert 'ids' in response.json()
+
+
+def test_empty_ids_give_empty_list(client, catalog):
+    response = client.get('/api/v1/titles/', {'ids': ''})
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,107 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+from reviews.services import hide
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def test_new_comment_is_listed_after_cached_count(user_client, catalog):
+    title = catalog['titles'][4]
+    review = Review.objects.create(
+        title=title, author=catalog['authors'][0], text='New', score=5
+    )
+    url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+    assert user_client.get(url).json()['count'] == 0
+    response = user_client.post(url, {'text': 'First'})
+    assert response.status_code == 201
+
+    page = user_client.get(url).json()
+    assert page['count'] == 1
+    assert [comment['text'] for comment in page['results']] == ['First']
+
+
+def test_pages_past_a_stale_count_are_fetched(client, catalog, settings):
+    review = catalog['titles'][0].reviews.get(score=6)
+    url = (f'/api/v1/titles/{review.title_id}/reviews/{review.pk}'
+           f'/comments/')
+    assert client.get(url + '?limit=1').json()['count'] == 2
+    # Bypass the signals, so the cached count stays stale.
+    Comment.objects.bulk_create([
+        Comment(review=review, author=catalog['authors'][2], text='Late')
+    ])
+    page = client.get(url + '?limit=1&offset=2').json()
+    assert [comment['text'] for comment in page['results']] == ['Late']
+    assert page['count'] == 3
+    assert page['next'] is not None
+
+
+def test_stale_title_save_keeps_review_count(admin_client, catalog):
+    title = catalog['titles'][4]
+    stale = Title.objects.get(pk=title.pk)
+    Review.objects.create(
+        title=title, author=catalog['authors'][0], text='New', score=5
+    )
+    stale.description = 'Changed'
+    stale.save()
+    title.refresh_from_db()
+    assert title.review_count == 1
+    assert title.description == 'Changed'
+
+    response = admin_client.patch(
+        f'/api/v1/titles/{title.pk}/', {'name': 'Renamed'}
+    )
+    assert response.status_code == 200
+    title.refresh_from_db()
+    assert title.review_count == 1
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.json()['count'], [
+        query['sql'] for query in queries if 'COUNT(' in query['sql']
+        and 'api_cache' not in query['sql']
+    ]
+
+
+def test_short_page_needs_no_count(client, catalog):
+    count, counts = count_queries(client, '/api/v1/titles/?limit=10')
+    assert count == 5
+    assert counts == []
+
+
+def test_count_skips_columns_and_annotations(client, catalog):
+    count, counts = count_queries(client, '/api/v1/titles/?limit=2')
+    assert count == 5
+    assert len(counts) == 1
+    assert 'AVG' not in counts[0].upper()
+    assert 'reviews_category' not in counts[0]
+
+    assert count_queries(client, '/api/v1/titles/?limit=2') == (5, [])
+
+
+def test_create_replaces_the_count_version(client, catalog):
+    assert count_queries(client, '/api/v1/titles/?limit=2')[0] == 5
+    Title.objects.create(name='New', year=2020)
+    count, counts = count_queries(client, '/api/v1/titles/?limit=2')
+    assert count == 6
+    assert len(counts) == 1
+
+
+def test_hiding_replaces_the_count_version(client, catalog):
+    review = catalog['titles'][0].reviews.get(score=6)
+    url = (f'/api/v1/titles/{review.title_id}/reviews/{review.pk}'
+           f'/comments/?limit=1')
+    assert client.get(url).json()['count'] == 2
+    hide(review.comments.all())
+    assert client.get(url).json()['count'] == 0
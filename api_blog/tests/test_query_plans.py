@@ -0,0 +1,75 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from api.filters import TitleFilter
+from api.management.commands.check_query_plans import (FULL_SCAN_MARKERS,
+                                                        Command)
+from api.views import TitleViewSet
+
+SORT_MARKERS = {
+    'sqlite': ('USE TEMP B-TREE FOR ORDER BY',),
+    'postgresql': ('Sort',),
+}
+
+pytestmark = pytest.mark.django_db
+
+
+def plan_lines(queryset, markers):
+    return [line for line in queryset.explain().splitlines()
+            if any(marker in line for marker in markers[connection.vendor])]
+
+
+@pytest.fixture(autouse=True)
+def supported_backend():
+    if connection.vendor not in FULL_SCAN_MARKERS:
+        pytest.skip(f'No plan markers for {connection.vendor}.')
+
+
+@pytest.mark.parametrize(
+    'label, queryset', list(Command().get_querysets()),
+    ids=lambda value: value if isinstance(value, str) else ''
+)
+def test_filtered_lists_use_indexes(label, queryset):
+    assert plan_lines(queryset, FULL_SCAN_MARKERS) == []
+
+
+def test_title_list_is_ordered():
+    queryset = TitleViewSet.queryset.all()
+    assert queryset.ordered
+    assert 'ORDER BY' in str(queryset.query)
+
+
+def test_unfiltered_title_page_is_read_in_id_order():
+    page = TitleViewSet.queryset.all()[:10]
+    assert plan_lines(page, SORT_MARKERS) == []
+
+
+@pytest.mark.parametrize('data', (
+    {'category': 'category'},
+    {'year': 2000},
+    {'name': 'name'},
+    {'category': 'category', 'year': 2000},
+))
+def test_filtered_title_page_is_read_in_id_order(data):
+    page = TitleFilter(data, TitleViewSet.queryset.all()).qs[:10]
+    assert plan_lines(page, SORT_MARKERS) == []
+
+
+def test_category_pages_use_category_index():
+    page = TitleFilter(
+        {'category': 'category'}, TitleViewSet.queryset.all()
+    ).qs[:10]
+    assert 'title_category_idx' in page.explain()
+
+
+def test_check_query_plans_command_passes():
+    call_command('check_query_plans')
+
+
+def test_title_pages_neither_skip_nor_repeat(client, catalog):
+    seen = []
+    for offset in range(0, len(catalog['titles']), 2):
+        response = client.get(f'/api/v1/titles/?limit=2&offset={offset}')
+        seen.extend(title['id'] for title in response.json()['results'])
+    assert seen == sorted(title.id for title in catalog['titles'])
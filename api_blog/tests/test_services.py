@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import CustomUser, Review
+from reviews.services import (
+    delete_title, delete_user, should_defer, user_descendants
+)
+from reviews.stats import recount
+
+
+def counters():
+    return list(CustomUser.objects.order_by('pk').values_list(
+        'review_count', 'comment_count', 'score_sum'))
+
+
+@pytest.mark.django_db
+def test_should_defer_compares_with_threshold(catalog, settings):
+    author = catalog['authors'][0]
+    comments, reviews = user_descendants(author)
+    total = reviews.count() + comments.count()
+    settings.BULK_DELETE_DEFER_THRESHOLD = total
+    assert not should_defer(comments, reviews)
+    settings.BULK_DELETE_DEFER_THRESHOLD = total - 1
+    assert should_defer(comments, reviews)
+    settings.BULK_DELETE_DEFER_THRESHOLD = reviews.count() - 1
+    assert should_defer(comments, reviews)
+
+
+@pytest.mark.django_db
+def test_deferred_user_content_is_skipped_on_read(client, catalog):
+    author = catalog['authors'][0]
+    title = catalog['titles'][0]
+    title.refresh_from_db()
+    review_count = title.review_count
+    with CaptureQueriesContext(connection) as queries:
+        delete_user(author, defer=True)
+    # Only the flag is written; the rest bumps cached count versions.
+    assert len([query for query in queries
+                if '"reviews_' in query['sql']]) == 1
+
+    author.refresh_from_db()
+    assert author.pending_deletion
+    # Rows and counters are left to 'purge_deleted'.
+    assert Review.objects.filter(author=author, is_hidden=False).exists()
+    title.refresh_from_db()
+    assert title.review_count == review_count
+    reviews = client.get(
+        f'/api/v1/titles/{title.id}/reviews/?limit=100').json()
+    assert author.username not in {
+        review['author'] for review in reviews['results']
+    }
+    for review in reviews['results']:
+        comments = client.get(
+            f'/api/v1/titles/{title.id}/reviews/{review["id"]}/comments/'
+        ).json()
+        assert author.username not in {
+            comment['author'] for comment in comments['results']
+        }
+    review = Review.objects.get(author=author, title=title)
+    response = client.get(
+        f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/')
+    assert response.status_code == 404
+    rating = client.get(f'/api/v1/titles/{title.id}/').json()['rating']
+    # Scores 6 and 7 remain without the pending author's 5.
+    assert rating == 6
+
+
+@pytest.mark.django_db
+def test_deferred_title_leaves_counters(catalog):
+    title = catalog['titles'][0]
+    delete_title(title, defer=True)
+    incremental = counters()
+    title.refresh_from_db()
+    assert title.review_count == 0
+    recount()
+    assert counters() == incremental
+    call_command('purge_deleted')
+    assert counters() == incremental
+
+
+@pytest.mark.django_db
+def test_deferred_user_is_purged(catalog):
+    author = catalog['authors'][0]
+    delete_user(author, defer=True)
+    call_command('purge_deleted')
+    assert not CustomUser.objects.filter(pk=author.pk).exists()
+    assert not Review.objects.filter(author=author).exists()
+    author = CustomUser.objects.get(pk=catalog['authors'][1].pk)
+    incremental = [author.review_count, author.comment_count]
+    recount()
+    author.refresh_from_db()
+    assert [author.review_count, author.comment_count] == incremental
@@ -0,0 +1,88 @@
+import json
+import logging
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+
+from api.middleware import SlowQueryRecorder
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def slow_queries(settings, caplog):
+    """Records every query of every request into caplog."""
+    settings.SLOW_QUERY_LOG_ENABLED = True
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_SAMPLE_RATE = 1
+    logger = logging.getLogger('api.slow_queries')
+    logger.addHandler(caplog.handler)
+    yield lambda: [json.loads(record.getMessage())
+                   for record in caplog.records
+                   if record.name == 'api.slow_queries']
+    logger.removeHandler(caplog.handler)
+
+
+def test_selects_are_logged_with_plan(client, catalog, slow_queries):
+    title = catalog['titles'][0]
+    response = client.get(f'/api/v1/titles/{title.pk}/')
+    assert response.status_code == 200
+    records = slow_queries()
+    assert records
+    record = next(
+        record for record in records if 'reviews_title' in record['sql']
+    )
+    assert record['route'] == 'titles-detail'
+    assert record['method'] == 'GET'
+    assert record['path'] == f'/api/v1/titles/{title.pk}/'
+    assert title.pk in record['params']
+    assert record['plan'] and 'EXPLAIN failed' not in record['plan']
+
+
+def test_only_selects_are_logged(user_client, catalog, slow_queries):
+    title = catalog['titles'][4]
+    response = user_client.post(
+        f'/api/v1/titles/{title.pk}/reviews/', {'text': 'New', 'score': 7}
+    )
+    assert response.status_code == 201
+    records = slow_queries()
+    assert records
+    assert all(
+        record['sql'].lstrip().upper().startswith('SELECT')
+        for record in records
+    )
+
+
+def test_executemany_is_skipped(slow_queries):
+    recorder = SlowQueryRecorder(RequestFactory().get('/'), 0)
+    executed = []
+
+    def execute(sql, params, many, context):
+        executed.append(sql)
+
+    recorder(execute, 'SELECT %s', [(1,), (2,)], True,
+             {'connection': connection})
+    assert executed == ['SELECT %s']
+    assert slow_queries() == []
+
+
+def test_explain_does_not_recurse(slow_queries):
+    recorder = SlowQueryRecorder(RequestFactory().get('/'), 0)
+    seen = []
+
+    def spy(execute, sql, params, many, context):
+        seen.append((sql, recorder.explaining))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(recorder), \
+            connection.execute_wrapper(spy):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    assert ('SELECT 1', False) in seen
+    assert any(
+        explaining for sql, explaining in seen if 'EXPLAIN' in sql
+    )
+    records = slow_queries()
+    assert [record['sql'] for record in records] == ['SELECT 1']
+    assert records[0]['route'] is None
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, CustomUser, Review
+from reviews.snapshot import SNAPSHOT_LEVELS
+
+pytestmark = pytest.mark.django_db
+
+PUB_DATE = datetime(2001, 2, 3, 4, 5, 6, 789012, tzinfo=timezone.utc)
+
+
+def rows(model):
+    return list(model._base_manager.order_by('pk').values_list(
+        *[field.attname for field in model._meta.concrete_fields]
+    ))
+
+
+def test_dump_restore_round_trip(tmp_path, catalog):
+    old = Review.objects.order_by('pk').first()
+    Review.objects.filter(pk=old.pk).update(pub_date=PUB_DATE)
+    models = [model for level in SNAPSHOT_LEVELS for model in level]
+    dumped = {model: rows(model) for model in models}
+    call_command('dump_snapshot', str(tmp_path), chunk_rows=5)
+    for model in reversed(models):
+        model._base_manager.all()._raw_delete(model.objects.db)
+
+    call_command('restore_snapshot', str(tmp_path))
+    for model in models:
+        assert rows(model) == dumped[model], model
+    # auto_now_add values are kept instead of being reset.
+    assert Review.objects.get(pk=old.pk).pub_date == PUB_DATE
+    top = max(pk for pk, *_ in dumped[Review])
+    review = Review.objects.create(
+        title=catalog['titles'][4], author=CustomUser.objects.first(),
+        text='After restore', score=5
+    )
+    assert review.pk > top
+    comment = Comment.objects.create(
+        review=review, author=review.author, text='After restore'
+    )
+    assert comment.pk > max(pk for pk, *_ in dumped[Comment])
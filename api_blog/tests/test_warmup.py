@@ -0,0 +1,44 @@
+import pytest
+from django.core.cache import cache
+from django.test import Client
+
+from api.warmup import prefill
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.RESPONSE_CACHE_TIMEOUT = 60
+    settings.WARMUP_PAGES = 2
+    cache.clear()
+
+
+@pytest.mark.parametrize('headers', (
+    {},
+    {'HTTP_ACCEPT': 'application/json'},
+    {'HTTP_ACCEPT': '*/*', 'HTTP_ACCEPT_ENCODING': 'gzip, deflate, br'},
+))
+def test_prefilled_pages_serve_real_requests(response_cache, catalog,
+                                             django_assert_num_queries,
+                                             headers):
+    urls = [url for url, *_ in prefill(2, 'testserver')]
+    assert urls[0] == '/api/v1/titles/'
+    next_url = Client().get('/api/v1/titles/').json()['next']
+    assert next_url in urls
+
+    client = Client()
+    # A hit reads only the change log head and the cache entry.
+    with django_assert_num_queries(2):
+        client.get('/api/v1/titles/', **headers)
+    with django_assert_num_queries(2):
+        client.get(next_url, **headers)
+
+
+def test_browsable_api_bypasses_response_cache(response_cache, catalog):
+    response = Client().get(
+        '/api/v1/titles/', HTTP_ACCEPT='text/html,application/xhtml+xml'
+    )
+    assert response['Content-Type'].startswith('text/html')
+    response = Client().get('/api/v1/titles/')
+    assert response['Content-Type'].startswith('application/json')